@@ -7,7 +7,13 @@ from typing import Sequence, Tuple, TYPE_CHECKING
 from aiocflib.crtp import CRTPPort
 from aiocflib.utils.quaternion import QuaternionXYZW
 
-from .localization import GenericLocalizationCommand, Localization, LocalizationChannel
+from .localization import (
+    GenericLocalizationCommand,
+    Localization,
+    LocalizationChannel,
+    MAX_POSES_PER_PACKED_PACKET,
+    MAX_POSITIONS_PER_PACKED_PACKET,
+)
 
 if TYPE_CHECKING:
     from aiocflib.crtp.broadcaster import _Broadcaster
@@ -23,15 +29,20 @@ async def broadcast_external_position_packed(
         broadcaster: the broadcaster to use
         items: a sequence of pairs containing a numeric Crazyflie ID
             (the last byte of its radio address) and a 3D coordinate.
-            Coordinates must be less than ~32.7 meters in absolute value.
-            At most four items fit into a single Crazyflie CRTP packet.
+            Coordinates must be between -32.768 and 32.767 meters after
+            rounding to the nearest millimeter. At most four items fit into a
+            single Crazyflie CRTP packet; when more items are given, they are
+            broadcast in as many packets as needed. No packet is sent when the
+            sequence is empty.
     """
-    data = Localization.encode_external_position_packed(items)
-    await broadcaster.send_packet(
-        port=CRTPPort.LOCALIZATION,
-        channel=LocalizationChannel.POSITION_PACKED,
-        data=data,
-    )
+    step = MAX_POSITIONS_PER_PACKED_PACKET
+    for start in range(0, len(items), step):
+        chunk = items[start : (start + step)]
+        await broadcaster.send_packet(
+            port=CRTPPort.LOCALIZATION,
+            channel=LocalizationChannel.POSITION_PACKED,
+            data=Localization.encode_external_position_packed(chunk),
+        )
 
 
 async def broadcast_external_pose_packed(
@@ -45,16 +56,23 @@ async def broadcast_external_pose_packed(
         broadcaster: the broadcaster to use
         items: a sequence of triplets containing a numeric Crazyflie ID
             (the last byte of its radio address), a 3D coordinate and a
-            4D quaternion in XYZW order. Coordinates must be less than ~32.7
-            meters in absolute value. At most two items fit into a single
-            Crazyflie CRTP packet.
+            4D quaternion in XYZW order. Coordinates must be between -32.768
+            and 32.767 meters after rounding to the nearest millimeter. At
+            most two items fit into a single Crazyflie CRTP packet; when more
+            items are given, they are broadcast in as many packets as needed.
+            No packet is sent when the sequence is empty.
     """
-    data = Localization.encode_external_pose_packed(items)
-    await broadcaster.send_packet(
-        port=CRTPPort.LOCALIZATION,
-        channel=LocalizationChannel.GENERIC,
-        data=bytes([GenericLocalizationCommand.EXT_POSE_PACKED]) + data,
-    )
+    step = MAX_POSES_PER_PACKED_PACKET
+    for start in range(0, len(items), step):
+        chunk = items[start : (start + step)]
+        data = bytearray(1 + Localization.EXTERNAL_POSE_PACKED_ITEM_SIZE * len(chunk))
+        data[0] = GenericLocalizationCommand.EXT_POSE_PACKED
+        Localization.encode_external_pose_packed_into(data, 1, chunk)
+        await broadcaster.send_packet(
+            port=CRTPPort.LOCALIZATION,
+            channel=LocalizationChannel.GENERIC,
+            data=bytes(data),
+        )
 
 
 async def broadcast_emergency_stop(broadcaster: "_Broadcaster") -> None:
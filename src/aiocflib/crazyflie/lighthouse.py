@@ -54,21 +54,23 @@ class LighthouseBsGeometry:
                 f"invalid length, expected {cls.size_in_bytes} bytes, got {len(data)}"
             )
 
-        result, _ = cls.unpack_from_bytes(data)
-        return result
+        return cls._from_items(cls._struct.unpack(data))
 
     @classmethod
     def from_json(cls, obj: Dict[str, Any]):
         """Constructs a Lighthouse base station geometry object from its JSON
         object representation created earlier with `to_json()`.
         """
-        assert len(obj["origin"]) == 3
-        assert len(obj["rotation"]) == 3 and all(
-            len(row) == 3 for row in obj["rotation"]
-        )
+        # Tuple unpacking raises ValueError if the shapes are wrong
+        ox, oy, oz = obj["origin"]
+        r0, r1, r2 = obj["rotation"]
+        rotation_matrix = (tuple(r0), tuple(r1), tuple(r2))
+        if any(len(row) != 3 for row in rotation_matrix):
+            raise ValueError("rotation matrix must be 3x3")
+
         return cls(
-            origin=tuple(obj["origin"]),  # type: ignore
-            rotation_matrix=tuple(tuple(row) for row in obj["rotation"]),  # type: ignore
+            origin=(ox, oy, oz),
+            rotation_matrix=rotation_matrix,  # type: ignore
             valid=True,
         )
 
@@ -92,16 +94,20 @@ class LighthouseBsGeometry:
                 f"invalid length, expected {cls.size_in_bytes} bytes, got {len(data) - offset}"
             )
 
-        items = cls._struct.unpack_from(data, offset)
-        origin = cast(Vector3D, items[:3])
-        rotation_matrix = cast(Matrix3D, (items[3:6], items[6:9], items[9:12]))
-        valid = items[12]
-
         return (
-            cls(origin=origin, rotation_matrix=rotation_matrix, valid=valid),
+            cls._from_items(cls._struct.unpack_from(data, offset)),
             offset + cls.size_in_bytes,
         )
 
+    @classmethod
+    def _from_items(cls, items: Tuple[Any, ...]):
+        """Constructs a Lighthouse base station geometry object from the items
+        unpacked from its raw byte-level representation.
+        """
+        origin = cast(Vector3D, items[:3])
+        rotation_matrix = cast(Matrix3D, (items[3:6], items[6:9], items[9:12]))
+        return cls(origin=origin, rotation_matrix=rotation_matrix, valid=items[12])
+
     def to_bytes(self) -> bytes:
         """Converts the Lighthouse base station geometry object into a raw
         byte-level representation used in the Lighthouse memory.
@@ -112,6 +118,18 @@ class LighthouseBsGeometry:
         items.append(self.valid)
         return self._struct.pack(*items)
 
+    def to_buffer(self, buf: bytearray, offset: int = 0) -> None:
+        """Writes the raw byte-level representation of the Lighthouse base
+        station geometry object into the given buffer, without allocating
+        an intermediate bytes object.
+
+        Parameters:
+            buf: the buffer to write into
+            offset: optional offset into the buffer
+        """
+        r0, r1, r2 = self.rotation_matrix
+        self._struct.pack_into(buf, offset, *self.origin, *r0, *r1, *r2, self.valid)
+
     def to_json(self) -> Dict[str, Any]:
         """Converts the Lighthouse base station data into a Python object that
         can be written directly into a JSON or YAML file.
@@ -136,6 +154,16 @@ class LighthouseCalibrationSweep:
     _struct: ClassVar[Struct] = Struct("<fffffff")
     size_in_bytes: ClassVar[int] = _struct.size
 
+    _JSON_KEYS: ClassVar[Tuple[str, ...]] = (
+        "phase",
+        "tilt",
+        "curve",
+        "gibmag",
+        "gibphase",
+        "ogeemag",
+        "ogeephase",
+    )
+
     @classmethod
     def from_bytes(cls, data: bytes):
         """Constructs a Lighthouse sweep calibration object from its raw
@@ -152,8 +180,7 @@ class LighthouseCalibrationSweep:
                 f"invalid length, expected {cls.size_in_bytes} bytes, got {len(data)}"
             )
 
-        obj, _ = cls.unpack_from_bytes(data)
-        return obj
+        return cls._from_items(cls._struct.unpack(data))
 
     @classmethod
     def from_json(cls, obj: Dict[str, Any]):
@@ -188,20 +215,26 @@ class LighthouseCalibrationSweep:
                 f"invalid length, expected {cls.size_in_bytes} bytes, got {len(data) - offset}"
             )
 
-        items = cls._struct.unpack_from(data, offset)
         return (
-            cls(
-                phase=items[0],
-                tilt=items[1],
-                curve=items[2],
-                gibmag=items[3],
-                gibphase=items[4],
-                ogeemag=items[5],
-                ogeephase=items[6],
-            ),
+            cls._from_items(cls._struct.unpack_from(data, offset)),
             offset + cls.size_in_bytes,
         )
 
+    @classmethod
+    def _from_items(cls, items: Tuple[Any, ...]):
+        """Constructs a Lighthouse sweep calibration object from the items
+        unpacked from its raw byte-level representation.
+        """
+        return cls(
+            phase=items[0],
+            tilt=items[1],
+            curve=items[2],
+            gibmag=items[3],
+            gibphase=items[4],
+            ogeemag=items[5],
+            ogeephase=items[6],
+        )
+
     def to_bytes(self) -> bytes:
         """Converts the Lighthouse sweep calibration object into a raw byte-level
         representation used in the Lighthouse memory.
@@ -216,19 +249,45 @@ class LighthouseCalibrationSweep:
             self.ogeephase,
         )
 
+    def to_buffer(self, buf: bytearray, offset: int = 0) -> None:
+        """Writes the raw byte-level representation of the Lighthouse sweep
+        calibration object into the given buffer, without allocating an
+        intermediate bytes object.
+
+        Parameters:
+            buf: the buffer to write into
+            offset: optional offset into the buffer
+        """
+        self._struct.pack_into(
+            buf,
+            offset,
+            self.phase,
+            self.tilt,
+            self.curve,
+            self.gibmag,
+            self.gibphase,
+            self.ogeemag,
+            self.ogeephase,
+        )
+
     def to_json(self) -> Dict[str, Any]:
         """Converts the Lighthouse sweep calibration data into a Python object that
         can be written directly into a JSON or YAML file.
         """
-        return {
-            "phase": self.phase,
-            "tilt": self.tilt,
-            "curve": self.curve,
-            "gibmag": self.gibmag,
-            "gibphase": self.gibphase,
-            "ogeemag": self.ogeemag,
-            "ogeephase": self.ogeephase,
-        }
+        return dict(
+            zip(
+                self._JSON_KEYS,
+                (
+                    self.phase,
+                    self.tilt,
+                    self.curve,
+                    self.gibmag,
+                    self.gibphase,
+                    self.ogeemag,
+                    self.ogeephase,
+                ),
+            )
+        )
 
 
 @dataclass(frozen=True)
@@ -262,7 +321,7 @@ class LighthouseBsCalibration:
                 f"invalid length, expected {cls.size_in_bytes} bytes, got {len(data)}"
             )
 
-        obj, _ = cls.unpack_from_bytes(data)
+        obj, _ = cls._unpack_from_bytes_unchecked(data, 0)
         return obj
 
     @classmethod
@@ -270,11 +329,12 @@ class LighthouseBsCalibration:
         """Constructs a Lighthouse base station calibration object from its JSON
         object representation created earlier with `to_json()`.
         """
-        assert len(obj["sweeps"]) == 2
+        sweep1, sweep2 = obj["sweeps"]
         return cls(
             uid=int(obj["uid"]),
-            sweeps=tuple(  # type: ignore
-                LighthouseCalibrationSweep.from_json(item) for item in obj["sweeps"]
+            sweeps=(
+                LighthouseCalibrationSweep.from_json(sweep1),
+                LighthouseCalibrationSweep.from_json(sweep2),
             ),
             valid=True,
         )
@@ -297,12 +357,26 @@ class LighthouseBsCalibration:
                 f"invalid length, expected {cls.size_in_bytes} bytes, got {len(data) - offset}"
             )
 
-        sweep1, offset = LighthouseCalibrationSweep.unpack_from_bytes(data, offset)
-        sweep2, offset = LighthouseCalibrationSweep.unpack_from_bytes(data, offset)
+        return cls._unpack_from_bytes_unchecked(data, offset)
 
-        items = cls._struct.unpack_from(data, offset)
+    @classmethod
+    def _unpack_from_bytes_unchecked(cls, data: bytes, offset: int):
+        """Same as `unpack_from_bytes()` but assumes that the caller has
+        already verified that the data is long enough.
+        """
+        sweep_struct = LighthouseCalibrationSweep._struct
+        sweep_size = sweep_struct.size
+        sweep1 = LighthouseCalibrationSweep._from_items(
+            sweep_struct.unpack_from(data, offset)
+        )
+        sweep2 = LighthouseCalibrationSweep._from_items(
+            sweep_struct.unpack_from(data, offset + sweep_size)
+        )
+
+        offset += 2 * sweep_size
+        uid, valid = cls._struct.unpack_from(data, offset)
         return (
-            cls(sweeps=(sweep1, sweep2), uid=items[0], valid=items[1]),
+            cls(sweeps=(sweep1, sweep2), uid=uid, valid=valid),
             offset + cls._struct.size,
         )
 
@@ -310,20 +384,30 @@ class LighthouseBsCalibration:
         """Converts the Lighthouse base station calibration object into a raw
         byte-level representation used in the Lighthouse memory.
         """
-        return b"".join(
-            [
-                self.sweeps[0].to_bytes(),
-                self.sweeps[1].to_bytes(),
-                self._struct.pack(self.uid, self.valid),
-            ]
-        )
+        buf = bytearray(self.size_in_bytes)
+        self.to_buffer(buf)
+        return bytes(buf)
+
+    def to_buffer(self, buf: bytearray, offset: int = 0) -> None:
+        """Writes the raw byte-level representation of the Lighthouse base
+        station calibration object into the given buffer, without allocating
+        an intermediate bytes object.
+
+        Parameters:
+            buf: the buffer to write into
+            offset: optional offset into the buffer
+        """
+        sweep_size = LighthouseCalibrationSweep.size_in_bytes
+        self.sweeps[0].to_buffer(buf, offset)
+        self.sweeps[1].to_buffer(buf, offset + sweep_size)
+        self._struct.pack_into(buf, offset + 2 * sweep_size, self.uid, self.valid)
 
     def to_json(self) -> Dict[str, Any]:
         """Converts the Lighthouse base station calibration data into a Python
         object that can be written directly into a JSON or YAML file.
         """
         return {
-            "sweeps": tuple(sweep.to_json() for sweep in self.sweeps),
+            "sweeps": (self.sweeps[0].to_json(), self.sweeps[1].to_json()),
             "uid": self.uid,
         }
 
@@ -587,10 +671,11 @@ class Lighthouse:
             index: the index of the base station
             calibration: the calibration data to set on the Crazyflie
         """
+        buf = bytearray(LighthouseBsCalibration.size_in_bytes)
+        calibration.to_buffer(buf)
+
         mem = await self._get_memory()
-        await mem.write(
-            self._get_address_of_bs_calibration(index), calibration.to_bytes()
-        )
+        await mem.write(self._get_address_of_bs_calibration(index), buf)
 
     async def set_calibrations(self, data: Dict[int, LighthouseBsCalibration]) -> None:
         """Sets the calibration data of multiple base stations.
@@ -637,8 +722,11 @@ class Lighthouse:
             index: the index of the base station
             geometry: the geometry data to set on the Crazyflie
         """
+        buf = bytearray(LighthouseBsGeometry.size_in_bytes)
+        geometry.to_buffer(buf)
+
         mem = await self._get_memory()
-        await mem.write(self._get_address_of_bs_geometry(index), geometry.to_bytes())
+        await mem.write(self._get_address_of_bs_geometry(index), buf)
 
     async def set_geometries(self, data: Dict[int, LighthouseBsGeometry]) -> None:
         """Sets the geometry data of multiple base stations.
@@ -2,7 +2,17 @@
 
 from enum import IntEnum
 from struct import Struct
-from typing import ClassVar, Iterable, Optional, Sequence, Tuple, Union
+from typing import (
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from aiocflib.crtp import CRTPPort
 from aiocflib.utils.quaternion import compress_unit_quaternion, QuaternionXYZW
@@ -15,6 +25,12 @@ __all__ = ("Localization",)
 #: Maximum number of supported Lighthouse base stations
 NUM_LIGHTHOUSE_BASE_STATIONS = 16
 
+#: Maximum number of items that fit into a single packed external position packet
+MAX_POSITIONS_PER_PACKED_PACKET = 4
+
+#: Maximum number of items that fit into a single packed external pose packet
+MAX_POSES_PER_PACKED_PACKET = 2
+
 
 class LocalizationChannel(IntEnum):
     """Enum representing the names of the channels in the localization service
@@ -49,16 +65,56 @@ class Localization:
     subsystem of a Crazyflie instance.
     """
 
+    __slots__ = ("_crazyflie",)
+
     _crazyflie: Crazyflie
 
     _external_position_struct: ClassVar[Struct] = Struct("<fff")
     _external_position_packed_item_struct: ClassVar[Struct] = Struct("<Bhhh")
     _external_pose_struct: ClassVar[Struct] = Struct("<Bfffffff")
     _external_pose_packed_item_struct: ClassVar[Struct] = Struct("<BhhhL")
-    _lpp_short_packet_struct: ClassVar[Struct] = Struct("<BB")
+
+    #: Size of a single item in a packed external position packet, in bytes
+    EXTERNAL_POSITION_PACKED_ITEM_SIZE: ClassVar[int] = (
+        _external_position_packed_item_struct.size
+    )
+
+    #: Size of a single item in a packed external pose packet, in bytes
+    EXTERNAL_POSE_PACKED_ITEM_SIZE: ClassVar[int] = (
+        _external_pose_packed_item_struct.size
+    )
+
+    # Structs specialized for packing a given number of items of a packed
+    # external position or pose packet in one go, keyed by the number of items.
+    # Only the item counts that fit into a single CRTP packet are cached; the
+    # structs for larger batches are created on-demand and are not kept around
+    # to avoid accumulating a struct for every batch size ever seen
+    _external_position_packed_structs: ClassVar[Dict[int, Struct]] = {
+        n: Struct("<" + "Bhhh" * n) for n in range(MAX_POSITIONS_PER_PACKED_PACKET + 1)
+    }
+    _external_pose_packed_structs: ClassVar[Dict[int, Struct]] = {
+        n: Struct("<" + "BhhhL" * n) for n in range(MAX_POSES_PER_PACKED_PACKET + 1)
+    }
     _lighthouse_angle_struct: ClassVar[Struct] = Struct("<Bfhhhfhhh")
     _lighthouse_persist_struct: ClassVar[Struct] = Struct("<HH")
 
+    # Bound methods of the structs above, cached to spare attribute lookups
+    # in the hot paths
+    _pack_external_position: ClassVar[Callable[..., bytes]] = (
+        _external_position_struct.pack
+    )
+    _pack_external_pose: ClassVar[Callable[..., bytes]] = _external_pose_struct.pack
+    _pack_lighthouse_persist: ClassVar[Callable[..., bytes]] = (
+        _lighthouse_persist_struct.pack
+    )
+
+    _all_base_stations_mask: ClassVar[int] = (1 << NUM_LIGHTHOUSE_BASE_STATIONS) - 1
+    _persist_all_base_stations_payload: ClassVar[bytes] = (
+        _lighthouse_persist_struct.pack(
+            _all_base_stations_mask, _all_base_stations_mask
+        )
+    )
+
     @classmethod
     def encode_external_position_packed(
         cls, items: Sequence[Tuple[int, Tuple[float, float, float]]]
@@ -72,15 +128,41 @@ class Localization:
         Parameters:
             items: a sequence of pairs containing a numeric Crazyflie ID
                 (the last byte of its radio address) and a 3D coordinate.
-                Coordinates must be less than ~32.7 meters in absolute value.
-                At most four items fit into a single Crazyflie CRTP packet.
+                Coordinates are rounded to the nearest millimeter and they must
+                be between -32.768 and 32.767 meters after rounding. At most
+                four items fit into a single Crazyflie CRTP packet.
+
+        Raises:
+            struct.error: if a coordinate is out of range
         """
-        return b"".join(
-            cls._external_position_packed_item_struct.pack(
-                id, int(x * 1000), int(y * 1000), int(z * 1000)
-            )
-            for id, (x, y, z) in items
-        )
+        args = cls._get_external_position_packed_args(items)
+        return cls._get_external_position_packed_struct(len(items)).pack(*args)
+
+    @classmethod
+    def encode_external_position_packed_into(
+        cls,
+        buf: bytearray,
+        offset: int,
+        items: Sequence[Tuple[int, Tuple[float, float, float]]],
+    ) -> int:
+        """Encodes the payload of a "packed external position" packet directly
+        into the given buffer, starting at the given offset.
+
+        See `encode_external_position_packed()` for more details.
+
+        Parameters:
+            buf: the buffer to write the payload into
+            offset: the offset into the buffer where the payload should start
+            items: a sequence of pairs containing a numeric Crazyflie ID and
+                a 3D coordinate
+
+        Returns:
+            the number of bytes written into the buffer
+        """
+        args = cls._get_external_position_packed_args(items)
+        struct = cls._get_external_position_packed_struct(len(items))
+        struct.pack_into(buf, offset, *args)
+        return struct.size
 
     @classmethod
     def encode_external_pose_packed(
@@ -95,20 +177,110 @@ class Localization:
         Parameters:
             items: a sequence of triplets containing a numeric Crazyflie ID
                 (the last byte of its radio address), a 3D coordinate and a
-                4D quaternion in XYZW order. Coordinates must be less than ~32.7
-                meters in absolute value. At most two items fit into a single
+                4D quaternion in XYZW order. Coordinates are rounded to the
+                nearest millimeter and they must be between -32.768 and 32.767
+                meters after rounding. At most two items fit into a single
                 Crazyflie CRTP packet.
+
+        Raises:
+            struct.error: if a coordinate is out of range
+        """
+        args = cls._get_external_pose_packed_args(items)
+        return cls._get_external_pose_packed_struct(len(items)).pack(*args)
+
+    @classmethod
+    def encode_external_pose_packed_into(
+        cls,
+        buf: bytearray,
+        offset: int,
+        items: Sequence[Tuple[int, Tuple[float, float, float], QuaternionXYZW]],
+    ) -> int:
+        """Encodes the payload of a "packed external pose" packet directly
+        into the given buffer, starting at the given offset.
+
+        See `encode_external_pose_packed()` for more details.
+
+        Parameters:
+            buf: the buffer to write the payload into
+            offset: the offset into the buffer where the payload should start
+            items: a sequence of triplets containing a numeric Crazyflie ID,
+                a 3D coordinate and a 4D quaternion in XYZW order
+
+        Returns:
+            the number of bytes written into the buffer
         """
-        return b"".join(
-            cls._external_pose_packed_item_struct.pack(
+        args = cls._get_external_pose_packed_args(items)
+        struct = cls._get_external_pose_packed_struct(len(items))
+        struct.pack_into(buf, offset, *args)
+        return struct.size
+
+    @staticmethod
+    def _get_external_position_packed_args(
+        items: Sequence[Tuple[int, Tuple[float, float, float]]],
+    ) -> List[int]:
+        """Returns the flattened list of values to pack into a packed external
+        position packet for the given items.
+        """
+        # Bind int() and round() to local names to avoid global lookups per
+        # coordinate. int() is needed because round() returns a float for
+        # NumPy scalars in NumPy 1.x, which Struct.pack() would reject.
+        int_, round_ = int, round
+
+        args: List[int] = []
+        for id, (x, y, z) in items:
+            args += (
                 id,
-                int(x * 1000),
-                int(y * 1000),
-                int(z * 1000),
-                compress_unit_quaternion(quat),
+                int_(round_(x * 1000)),
+                int_(round_(y * 1000)),
+                int_(round_(z * 1000)),
             )
-            for id, (x, y, z), quat in items
-        )
+
+        return args
+
+    @staticmethod
+    def _get_external_pose_packed_args(
+        items: Sequence[Tuple[int, Tuple[float, float, float], QuaternionXYZW]],
+    ) -> List[int]:
+        """Returns the flattened list of values to pack into a packed external
+        pose packet for the given items.
+        """
+        # Local aliases for the same reason as in
+        # _get_external_position_packed_args()
+        int_, round_, compress = int, round, compress_unit_quaternion
+
+        args: List[int] = []
+        for id, (x, y, z), quat in items:
+            args += (
+                id,
+                int_(round_(x * 1000)),
+                int_(round_(y * 1000)),
+                int_(round_(z * 1000)),
+                compress(quat),
+            )
+
+        return args
+
+    @classmethod
+    def _get_external_position_packed_struct(cls, num_items: int) -> Struct:
+        """Returns a struct that packs the given number of items of a packed
+        external position packet in one go.
+        """
+        struct = cls._external_position_packed_structs.get(num_items)
+        if struct is None:
+            item_format = cls._external_position_packed_item_struct.format[1:]
+            struct = Struct("<" + item_format * num_items)
+        return struct
+
+    @classmethod
+    def _get_external_pose_packed_struct(cls, num_items: int) -> Struct:
+        """Returns a struct that packs the given number of items of a packed
+        external pose packet in one go.
+        """
+        struct = cls._external_pose_packed_structs.get(num_items)
+        if struct is None:
+            item_format = cls._external_pose_packed_item_struct.format[1:]
+            struct = Struct("<" + item_format * num_items)
+        return struct
 
     def __init__(self, crazyflie: Crazyflie):
         """Constructor.
@@ -144,15 +316,10 @@ class Localization:
             z; the Z coordinate
         """
         if y is None and z is None:
-            if isinstance(x, Iterable):
-                data = self._external_position_struct.pack(*x)
-            else:
-                raise TypeError(
-                    "x must be a sequence of floats when y and z are not given"
-                )
-        else:
-            data = self._external_position_struct.pack(x, y, z)
+            # Raises TypeError or ValueError if x is not a 3D vector
+            x, y, z = x  # type: ignore
 
+        data = self._pack_external_position(x, y, z)
         await self._send_packet(
             data,
             channel=LocalizationChannel.EXTERNAL_POSITION,
@@ -171,7 +338,7 @@ class Localization:
         x, y, z = pos
         qx, qy, qz, qw = quat
         await self._send_packet(
-            self._external_pose_struct.pack(
+            self._pack_external_pose(
                 GenericLocalizationCommand.EXT_POSE, x, y, z, qx, qy, qz, qw
             ),
         )
@@ -191,7 +358,7 @@ class Localization:
             port=CRTPPort.LOCALIZATION,
             channel=LocalizationChannel.GENERIC,
             command=GenericLocalizationCommand.LPP_SHORT_PACKET,
-            data=self._lpp_short_packet_struct.pack(dest_id) + data,
+            data=bytes((dest_id,)) + data,
         )
         return len(response) > 0 and bool(response[0])
 
@@ -213,10 +380,16 @@ class Localization:
         self,
         geo_list: Optional[Iterable[int]] = None,
         calib_list: Optional[Iterable[int]] = None,
+        *,
+        geo_mask: Optional[int] = None,
+        calib_mask: Optional[int] = None,
     ) -> bool:
         """Instructs the Crazyflie to persist the currently estimated geometry
         and calibration data of the Lighthouse subsystem into permanent storage.
 
+        The base stations may be given either as lists of IDs or as precomputed
+        bitmasks, but not both for the same kind of data.
+
         Parameters:
             geo_list: IDs of the Lighthouse base stations (0-based) whose
                 geometry data must be persisted. Defaults to all stations when
@@ -224,39 +397,97 @@ class Localization:
             calib_list: IDs of the Lighthouse base stations (0-based) whose
                 calibration data must be persisted. Defaults to the same value
                 as the geometry list when omitted.
+            geo_mask: bitmask of the Lighthouse base stations whose geometry
+                data must be persisted, where bit N is set if and only if base
+                station N is included. Alternative to ``geo_list``.
+            calib_mask: bitmask of the Lighthouse base stations whose
+                calibration data must be persisted. Alternative to
+                ``calib_list``; defaults to the geometry bitmask.
 
         Returns:
             whether the data was persisted successfully
-        """
-        if geo_list is None:
-            geo_list = range(NUM_LIGHTHOUSE_BASE_STATIONS)
-
-        if calib_list is None:
-            calib_list = geo_list
 
-        if not _is_valid_lighthouse_base_station_id_list(geo_list):
-            raise ValueError("Geometry base station ID list is invalid")
-        if not _is_valid_lighthouse_base_station_id_list(calib_list):
-            raise ValueError("Calibration base station ID list is invalid")
-
-        geo_mask, calib_mask = 0, 0
-        for id in geo_list:
-            geo_mask |= 1 << id
-        for id in calib_list:
-            calib_mask |= 1 << id
+        Raises:
+            TypeError: if an ID list is not an iterable or a bitmask is not an
+                integer
+            ValueError: if an ID list contains an invalid base station ID, a
+                bitmask refers to an invalid base station, or both an ID list
+                and a bitmask were given for the same kind of data
+        """
+        if (
+            geo_list is None
+            and calib_list is None
+            and geo_mask is None
+            and calib_mask is None
+        ):
+            payload = self._persist_all_base_stations_payload
+        else:
+            geo_mask = _get_lighthouse_base_station_mask(
+                geo_list, geo_mask, default=self._all_base_stations_mask
+            )
+            calib_mask = _get_lighthouse_base_station_mask(
+                calib_list, calib_mask, default=geo_mask
+            )
+            payload = self._pack_lighthouse_persist(geo_mask, calib_mask)
 
         response = await self._crazyflie.run_command(
             port=CRTPPort.LOCALIZATION,
             channel=LocalizationChannel.GENERIC,
             command=GenericLocalizationCommand.LH_PERSIST_DATA,
-            data=self._lighthouse_persist_struct.pack(geo_mask, calib_mask),
+            data=payload,
         )
 
         return len(response) > 0 and bool(response[0])
 
 
-def _is_valid_lighthouse_base_station_id_list(ids: Iterable[int]) -> bool:
-    return all(
-        isinstance(id, int) and id >= 0 and id < NUM_LIGHTHOUSE_BASE_STATIONS
-        for id in ids
-    )
+def _get_lighthouse_base_station_mask(
+    ids: Optional[Iterable[int]], mask: Optional[int], *, default: int
+) -> int:
+    """Returns the bitmask of the Lighthouse base stations given either as a
+    list of IDs or as a bitmask, validating the input.
+
+    Parameters:
+        ids: the list of base station IDs, or `None` if it was not given
+        mask: the bitmask of the base stations, or `None` if it was not given
+        default: the bitmask to return if neither the IDs nor the bitmask
+            were given
+
+    Raises:
+        TypeError: if the ID list is not an iterable or the bitmask is not an
+            integer
+        ValueError: if the ID list contains an invalid base station ID, the
+            bitmask refers to an invalid base station, or both the IDs and
+            the bitmask were given
+    """
+    if mask is None:
+        return default if ids is None else _lighthouse_base_station_id_list_to_mask(ids)
+
+    if ids is not None:
+        raise ValueError("Base station ID list and bitmask are mutually exclusive")
+    if not isinstance(mask, int) or isinstance(mask, bool):
+        raise TypeError(f"Lighthouse base station bitmask must be an integer: {mask!r}")
+    if mask < 0 or mask.bit_length() > NUM_LIGHTHOUSE_BASE_STATIONS:
+        raise ValueError(f"Invalid Lighthouse base station bitmask: {mask!r}")
+    return mask
+
+
+def _lighthouse_base_station_id_list_to_mask(ids: Iterable[int]) -> int:
+    """Converts a list of Lighthouse base station IDs into a bitmask, validating
+    the IDs in the same pass.
+
+    Raises:
+        TypeError: if the argument is an integer instead of a list of IDs
+        ValueError: if the list contains an invalid base station ID
+    """
+    if isinstance(ids, int):
+        raise TypeError(
+            f"Expected a list of Lighthouse base station IDs, got {ids!r}; "
+            "use the mask arguments for bitmasks"
+        )
+
+    mask = 0
+    for id in ids:
+        if not isinstance(id, int) or id < 0 or id >= NUM_LIGHTHOUSE_BASE_STATIONS:
+            raise ValueError(f"Invalid Lighthouse base station ID: {id!r}")
+        mask |= 1 << id
+    return mask
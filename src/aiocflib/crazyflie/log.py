@@ -1,17 +1,29 @@
 """Classes related to accessing the logging subsystem of a Crazyflie."""
 
-from anyio import Lock
+from anyio import (
+    BrokenResourceError,
+    CancelScope,
+    ClosedResourceError,
+    create_memory_object_stream,
+    create_task_group,
+    EndOfStream,
+    Lock,
+    WouldBlock,
+)
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
 from contextlib import asynccontextmanager, AsyncExitStack
 from dataclasses import dataclass
 from enum import IntEnum
-from functools import partial
-from itertools import count, zip_longest
+from functools import cached_property, partial
+from itertools import count
 from struct import Struct, error as StructError
+from sys import intern
 from typing import (
     Any,
     AsyncIterable,
     Awaitable,
     Callable,
+    ClassVar,
     Dict,
     Iterable,
     Iterator,
@@ -35,6 +47,9 @@ __all__ = ("Log", "LogBlock")
 #: The maximum size of a CRTP packet payload
 MAX_LOG_DATA_PACKET_SIZE = 28
 
+#: Struct used to parse the response to a log TOC info request
+_toc_info_struct = Struct("<HIBB")
+
 
 class LoggingChannel(IntEnum):
     """Enum representing the names of the channels of the logging service in
@@ -77,19 +92,42 @@ class LoggingControlCommand(IntEnum):
     APPEND_BLOCK_V2 = 7
 
 
-#: Dictionary mapping integer type codes to their C types, Python structs and
-#: aliases
-_type_properties = {
+#: Tuple mapping integer type codes to their C types, Python structs and
+#: aliases. Type codes form a dense range starting from 1 so we can index the
+#: tuple directly with the type code; index zero is unused.
+_type_properties: Tuple[Optional[Tuple[str, Struct, Tuple[str, ...]]], ...] = (
     # C type, Python struct, aliases
-    0x01: ("uint8_t", Struct("<B"), ("uint8", "u8")),
-    0x02: ("uint16_t", Struct("<H"), ("uint16", "u16")),
-    0x03: ("uint32_t", Struct("<L"), ("uint32", "u32")),
-    0x04: ("int8_t", Struct("<b"), ("int8", "i8")),
-    0x05: ("int16_t", Struct("<h"), ("int16", "i16")),
-    0x06: ("int32_t", Struct("<i"), ("int32", "i32")),
-    0x07: ("float", Struct("<f"), ()),
-    0x08: ("fp16", Struct("<h"), ()),
-}
+    None,
+    ("uint8_t", Struct("<B"), ("uint8", "u8")),
+    ("uint16_t", Struct("<H"), ("uint16", "u16")),
+    ("uint32_t", Struct("<L"), ("uint32", "u32")),
+    ("int8_t", Struct("<b"), ("int8", "i8")),
+    ("int16_t", Struct("<h"), ("int16", "i16")),
+    ("int32_t", Struct("<i"), ("int32", "i32")),
+    ("float", Struct("<f"), ()),
+    ("fp16", Struct("<h"), ()),
+)
+
+#: Tuples mapping integer type codes to the bound pack and unpack methods of
+#: their Python structs, to spare attribute lookups in the hot paths
+_type_pack: Tuple[Optional[Callable[..., bytes]], ...] = tuple(
+    props[1].pack if props else None for props in _type_properties
+)
+_type_unpack: Tuple[Optional[Callable[[bytes], Tuple[Any, ...]]], ...] = tuple(
+    props[1].unpack if props else None for props in _type_properties
+)
+
+#: Tuple mapping integer type codes to the number of bytes that a single value
+#: of the type occupies
+_type_length: Tuple[int, ...] = tuple(
+    props[1].size if props else 0 for props in _type_properties
+)
+
+#: Tuple mapping integer type codes to the format characters of their Python
+#: structs, without the byte order prefix
+_type_format_char: Tuple[str, ...] = tuple(
+    props[1].format[1:] if props else "" for props in _type_properties
+)
 
 
 class VariableType(IntEnum):
@@ -121,14 +159,15 @@ class VariableType(IntEnum):
     @property
     def aliases(self) -> Tuple[str]:
         """Returns the registered type aliases of this type."""
-        return (_type_properties[self][0],) + _type_properties[self][2]
+        props = _type_properties[self]
+        return (props[0],) + props[2]
 
     @property
     def length(self) -> int:
         """Returns the number of bytes that a single value of this log
         variable would occupy.
         """
-        return self.struct.size
+        return _type_length[self]
 
     @property
     def struct(self) -> Struct:
@@ -141,7 +180,7 @@ class VariableType(IntEnum):
         """Encodes a single value of this log variable type into its raw
         byte-level representation.
         """
-        return self.struct.pack(value)
+        return _type_pack[self](value)
 
 
 #: Type specification for objects that can be converted into a log variable type
@@ -165,48 +204,46 @@ class VariableSpecification:
     def from_bytes(cls, data: bytes, id: int):
         try:
             type = data[0] & 0x0F
-            group, name, *rest = data[1:].split(b"\x00")
+            sep = data.index(0, 1)
+            end = data.find(0, sep + 1)
+            if end < 0:
+                end = len(data)
             return cls(
                 id=id,
                 type=type,
-                group=group.decode("ascii"),
-                name=name.decode("ascii"),
+                group=intern(str(data[1:sep], "ascii")),
+                name=intern(str(data[(sep + 1) : end], "ascii")),
             )
-        except Exception:
+        except (IndexError, ValueError):
             raise ValueError("invalid log variable description") from None
 
     def encode_value(self, value) -> bytes:
         """Encodes a single value of this log variable into its raw byte-level
         representation.
         """
-        return _type_properties[self.type][1].pack(value)
+        return _type_pack[self.type](value)
 
-    @property
+    @cached_property
     def full_name(self) -> str:
         """Returns the fully-qualified name of the log variable, which is
         the concatenation of the group and the name of the variable, separated
         by a dot.
         """
-        return "{0.group}.{0.name}".format(self)
+        return intern("{0.group}.{0.name}".format(self))
 
     def parse_value(self, data: bytes):
         """Parses the raw byte-level representation of a single value of this
         log variable, as received from the Crazyflie, and returns the
         corresponding Python value.
         """
-        return _type_properties[self.type][1].unpack(data)[0]
+        return _type_unpack[self.type](data)[0]
 
     def to_bytes(self) -> bytes:
-        header = int(self.type) & 0x0F
-
-        parts = []
-        parts.append(bytes((header,)))
-        parts.append(self.group.encode("ascii"))
-        parts.append(b"\x00")
-        parts.append(self.name.encode("ascii"))
-        parts.append(b"\x00")
-
-        return b"".join(parts)
+        return b"%c%b\x00%b\x00" % (
+            int(self.type) & 0x0F,
+            self.group.encode("ascii"),
+            self.name.encode("ascii"),
+        )
 
 
 @dataclass(frozen=True)
@@ -223,16 +260,31 @@ class LogBlockItem:
     fetch_as: VariableType
     stored_as: VariableType
 
+    _struct: ClassVar[Struct] = Struct("<BH")
+    size_in_bytes: ClassVar[int] = _struct.size
+
+    def to_buffer(self, buf: bytearray, offset: int = 0) -> None:
+        """Writes the byte-level representation of this item into the given
+        buffer, without allocating an intermediate bytes object.
+
+        Parameters:
+            buf: the buffer to write into
+            offset: optional offset into the buffer
+        """
+        self._struct.pack_into(
+            buf,
+            offset,
+            ((self.fetch_as << 4) & 0xF0) | (self.stored_as & 0x0F),
+            self.id & 0xFFFF,
+        )
+
     def to_bytes(self) -> bytes:
         """Returns a byte-level representation of this item that can be used in
         a `CREATE_BLOCK` request.
         """
-        return bytes(
-            (
-                ((self.fetch_as << 4) & 0xF0) | (self.stored_as & 0x0F),
-                self.id & 0xFF,
-                self.id >> 8,
-            )
+        return self._struct.pack(
+            ((self.fetch_as << 4) & 0xF0) | (self.stored_as & 0x0F),
+            self.id & 0xFFFF,
         )
 
 
@@ -240,6 +292,8 @@ class LogBlockItem:
 class LogMessage:
     """Value object representing a single log message from the Crazyflie."""
 
+    __slots__ = ("timestamp", "block", "items", "handler")
+
     timestamp: int
     block: "LogBlock"
     items: Tuple
@@ -248,16 +302,30 @@ class LogMessage:
     @classmethod
     def from_bytes(
         cls,
-        data: bytes,
+        data: Union[bytes, bytearray, memoryview],
         block: "LogBlock",
         handler: Optional["LogMessageHandler"] = None,
     ):
-        return cls(
-            block=block,
-            timestamp=int.from_bytes(data[1:4], byteorder="little"),
-            items=block._decode_values(data),
-            handler=handler,
-        )
+        """Constructs a log message from the data part of a log packet received
+        from the Crazyflie.
+
+        Parameters:
+            data: the data part of the log packet, starting from the log block
+                ID. Any object supporting the buffer protocol is accepted; the
+                values are decoded in place, without slicing or copying it.
+            block: the log block that the message belongs to
+            handler: the handler associated to the log block, if any
+        """
+        timestamp, items = block._decode_values(data)
+        return cls(block=block, timestamp=timestamp, items=items, handler=handler)
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        # The dataclass is frozen so we need to bypass its __setattr__()
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
 
     def process(self, *args, **kwds):
         """Syntactic sugar for calling the message handler associated with the
@@ -303,9 +371,24 @@ def _process_period_and_frequency(
     """
     if period_msec is not None:
         return int(period_msec)
-    if frequency is None:
-        frequency = 1.0 / period if period is not None else 10.0
-    return int(1000.0 // frequency)
+    if frequency is not None:
+        return round(1000 / frequency)
+    if period is not None:
+        return round(period * 1000)
+    return default
+
+
+def _period_msec_to_byte(period_msec: int) -> int:
+    """Converts a logging period in milliseconds to the single byte that
+    encodes it in a `START_LOGGING` request.
+
+    Raises:
+        ValueError: if the period cannot be encoded in a single byte
+    """
+    period_byte = int(period_msec / 10)
+    if period_byte < 0 or period_byte > 255:
+        raise ValueError("logging period must be between 0 and 2.55 seconds")
+    return period_byte
 
 
 class LogBlock:
@@ -317,7 +400,10 @@ class LogBlock:
 
     _id: Optional[int]
     _items: List[LogBlockItem]
+    _item_names: Tuple[str, ...]
+    _serialized: Optional[bytes]
     _struct: Optional[Struct]
+    _unpack_from: Optional[Callable[[bytes], Tuple[Any, ...]]]
 
     def __init__(self, owner: "Log"):
         """Constructor.
@@ -330,7 +416,11 @@ class LogBlock:
 
         self._id = None
         self._items = []
+        self._item_names = ()
+        self._packet_size = 0
+        self._serialized = None
         self._struct = None
+        self._unpack_from = None
 
     @property
     def id(self) -> Optional[int]:
@@ -366,12 +456,18 @@ class LogBlock:
         """Returns the total number of bytes that the data in this log
         configuration would occupy.
         """
-        return sum(item.fetch_as.length for item in self._items)
+        return self._packet_size
 
     def add_variable(
         self, name: str, type: Optional[Union[int, VariableType]] = None
     ) -> None:
-        """Adds a new variable to this logging block."""
+        """Adds a new variable to this logging block.
+
+        Raises:
+            KeyError: if there is no such variable in the log TOC
+            ValueError: if the variable would not fit into the log packet
+                of the block any more
+        """
         toc = self._owner._variables_by_name
         try:
             spec = toc[name]
@@ -382,12 +478,23 @@ class LogBlock:
             type = spec.type
 
         item = LogBlockItem(
-            name=name,
+            name=spec.full_name,
             id=spec.id,
             stored_as=VariableType(spec.type),
             fetch_as=VariableType(type),
         )
+
+        size = self._packet_size + item.fetch_as.length
+        if size > MAX_LOG_DATA_PACKET_SIZE:
+            raise ValueError(
+                "log packet too large ({0} bytes, max is {1})".format(
+                    size, MAX_LOG_DATA_PACKET_SIZE
+                )
+            )
+
         self._items.append(item)
+        self._packet_size = size
+        self._serialized = None
 
     async def receive(
         self,
@@ -417,10 +524,22 @@ class LogBlock:
             "period_msec": period_msec,
             "frequency": frequency,
         }
-        async with self.submitted(allow_multi=True):
-            async with self.started(**start_args):
-                async for packet in self._owner.data_packets():
-                    yield LogMessage.from_bytes(packet.data, block=self)
+        if self.is_submitted:
+            stop = await self.start(**start_args)
+        else:
+            # Block is not submitted yet so we can create and start it in one
+            # go; stopping it will also remove it from the Crazyflie
+            id, disposer = await self._owner._submit_and_start_block(
+                self, _process_period_and_frequency(**start_args)
+            )
+            self._set_submitted(id, disposer)
+            stop = self._dispose
+
+        try:
+            async for packet in self._owner._block_data_packets(self.id):
+                yield LogMessage.from_bytes(packet.data, block=self)
+        finally:
+            await stop()
 
     async def start(
         self,
@@ -509,25 +628,43 @@ class LogBlock:
             else:
                 raise RuntimeError("log block is already submitted to Crazyflie")
 
-        id, self._disposer = await self._owner._submit_block(self)
-        self.id = id
+        id, disposer = await self._owner._submit_block(self)
+        self._set_submitted(id, disposer)
 
-        format_strings = [item.fetch_as.struct.format[1:] for item in self._items]
-        if format_strings and isinstance(format_strings[0], bytes):
-            # Python <3.7
-            format_strings = [fmt.decode("ascii") for fmt in format_strings]  # type: ignore
+        return self._dispose
 
-        self._struct = Struct("<" + "".join(format_strings))
+    def _set_submitted(self, id: int, disposer: Disposer) -> None:
+        """Records that the block was submitted to the Crazyflie with the given
+        ID and prepares the block for decoding the log messages belonging to
+        it.
 
-        return self._dispose
+        Parameters:
+            id: the ID of the block on the Crazyflie
+            disposer: async function that removes the block from the Crazyflie
+        """
+        self.id = id
+        self._disposer = disposer
+
+        # The struct decodes the entire data section of a log packet. The
+        # block ID and the 24-bit timestamp are decoded together as a single
+        # little-endian 32-bit integer; the timestamp is in the upper 24 bits
+        self._struct = Struct(
+            "<I" + "".join(_type_format_char[item.fetch_as] for item in self._items)
+        )
+        self._unpack_from = self._struct.unpack_from
+        self._item_names = tuple(item.name for item in self._items)
 
     @asynccontextmanager
     async def submitted(self, allow_multi: bool = False):
         """Async context manager that submits the log specification to the
         Crazyflie when entering the context and removes it when exiting the
         context.
+
+        Parameters:
+            allow_multi: whether to allow entering the context when the block
+                is already submitted. See `submit()` for more details.
         """
-        disposer = await self.submit()
+        disposer = await self.submit(allow_multi=allow_multi)
         try:
             yield
         finally:
@@ -537,20 +674,31 @@ class LogBlock:
         """Returns a byte-level representation of this logging block that can
         be used in a `CREATE_BLOCK` request.
         """
-        self._validate_packet_size()
-        return b"".join(item.to_bytes() for item in self._items)
+        if self._serialized is None:
+            item_size = LogBlockItem.size_in_bytes
+            buf = bytearray(item_size * len(self._items))
+            for index, item in enumerate(self._items):
+                item.to_buffer(buf, index * item_size)
+
+            self._serialized = bytes(buf)
+
+        return self._serialized
 
-    def _decode_values(self, data: bytes) -> Tuple:
-        """Decodes the values received in a log message from the Crazyflie.
+    def _decode_values(
+        self, data: Union[bytes, bytearray, memoryview]
+    ) -> Tuple[int, Tuple]:
+        """Decodes the timestamp and the values received in a log message from
+        the Crazyflie.
 
         Parameters:
             data: the data part of the Crazyflie log message, starting from the
                 log block ID.
 
         Returns:
-            the decoded values
+            the timestamp and the decoded values
         """
-        return self._struct.unpack_from(data, offset=4)  # type: ignore
+        values = self._unpack_from(data)  # type: ignore
+        return values[0] >> 8, values[1:]
 
     async def _dispose(self):
         """Removes this log block from the Crazyflie."""
@@ -566,26 +714,7 @@ class LogBlock:
             self._disposer = None
 
     def _to_dict(self, values: Iterable[Any]) -> Dict[str, Any]:
-        return {
-            item.name: value
-            for item, value in zip_longest(self._items, values, fillvalue=None)
-            if item is not None
-        }
-
-    def _validate_packet_size(self):
-        """Checks whether the contents of this log specification would fit into
-        a single CRTP packet.
-
-        Raises:
-            ValueError: if there are too many entries in the specification
-        """
-        size = self.packet_size
-        if size > MAX_LOG_DATA_PACKET_SIZE:
-            raise ValueError(
-                "log packet too large ({0} bytes, max is {1})".format(
-                    size, MAX_LOG_DATA_PACKET_SIZE
-                )
-            )
+        return dict(zip(self._item_names, values))
 
 
 class LogSession:
@@ -615,6 +744,7 @@ class LogSession:
 
         self._remove_existing_log_blocks_when_starting = False
         self._cleanup_gracefully = False
+        self._handler_queue_size = 0
 
     def add_block(
         self,
@@ -664,6 +794,7 @@ class LogSession:
         self,
         *,
         graceful_cleanup: Optional[bool] = None,
+        handler_queue_size: Optional[int] = None,
         remove_existing_log_blocks: Optional[bool] = None,
     ) -> None:
         """Conifigures the behaviour of the log session during startup and
@@ -673,11 +804,19 @@ class LogSession:
             graceful_cleanup: whether to attempt to clean up gracefully when the
                 session is stopped. Exceptions will be handled and silenced
                 during cleanup when possible.
+            handler_queue_size: size of the queue between the task receiving
+                log messages and the task calling the handler functions in
+                `process_messages()`. Zero means that the handlers are called
+                directly from the receiving task, without a queue.
             remove_existing_log_blocks: whether to remove all existing log
                 blocks from the Crazyflie when this session starts.
         """
         if graceful_cleanup is not None:
             self._cleanup_gracefully = bool(graceful_cleanup)
+        if handler_queue_size is not None:
+            if handler_queue_size < 0:
+                raise ValueError("handler queue size must be non-negative")
+            self._handler_queue_size = int(handler_queue_size)
         if remove_existing_log_blocks is not None:
             self._remove_existing_log_blocks_when_starting = bool(
                 remove_existing_log_blocks
@@ -733,7 +872,9 @@ class LogSession:
         if self._remove_existing_log_blocks_when_starting:
             await self._owner.reset()
 
-        id_mapping = {}
+        # Block IDs are single bytes on the wire, so a list indexed by the ID
+        # is both dense and bounded
+        id_mapping = [None] * 256
         for entry in self._blocks:
             block, _, _ = entry
             await self._exit_stack.enter_async_context(block.submitted())
@@ -764,17 +905,8 @@ class LogSession:
         call the handler functions by invoking the `process()` method on the
         yielded log messages.
         """
-        if self._id_mapping is None:
-            raise RuntimeError(
-                "You must enter the session context first; use 'async with'"
-            )
-
-        id_mapping = self._id_mapping
-        async for packet in self._owner.data_packets():
-            log_block_id = packet.data[0]
-            entry = id_mapping.get(log_block_id)
-            if entry is not None:
-                block, _, handler = entry
+        async with aclosing(self._packets_with_entries()) as gen:
+            async for packet, (block, _, handler) in gen:
                 yield LogMessage.from_bytes(packet.data, block=block, handler=handler)
 
     async def process_messages(self) -> None:
@@ -784,10 +916,70 @@ class LogSession:
         want to spawn a long-running task in response to a message, spawn it
         inside the handler function on your own or send the message to a queue,
         which can then be processed from another task.
+
+        When a handler queue is configured with `configure()`, the handler
+        functions are called from a separate task so a slow handler does not
+        hold up the reception of log packets until the queue fills up.
         """
-        async with aclosing(self.messages()) as gen:
-            async for message in gen:
+        if not self._handler_queue_size:
+            # Call the handlers inline. Packets of blocks without a handler
+            # are not decoded at all.
+            async with aclosing(self._packets_with_entries()) as gen:
+                async for packet, (block, _, handler) in gen:
+                    if handler is not None:
+                        handler(
+                            LogMessage.from_bytes(
+                                packet.data, block=block, handler=handler
+                            )
+                        )
+            return
+
+        tx_queue, rx_queue = create_memory_object_stream[LogMessage](
+            self._handler_queue_size
+        )
+        async with create_task_group() as tg:
+            tg.start_soon(self._process_messages_from_queue, rx_queue)
+            async with tx_queue, aclosing(self.messages()) as gen:
+                async for message in gen:
+                    if message.handler is not None:
+                        await tx_queue.send(message)
+
+    async def _packets_with_entries(self):
+        """Yields the log data packets that belong to the log blocks of the
+        session, along with the session entries of the corresponding blocks.
+        Each entry is a tuple consisting of the block, its logging period and
+        its handler.
+        """
+        if self._id_mapping is None:
+            raise RuntimeError(
+                "You must enter the session context first; use 'async with'"
+            )
+
+        id_mapping = self._id_mapping
+        async for packet in self._owner.data_packets():
+            entry = id_mapping[packet.data[0]]
+            if entry is not None:
+                yield packet, entry
+
+    @staticmethod
+    async def _process_messages_from_queue(
+        queue: MemoryObjectReceiveStream[LogMessage],
+    ) -> None:
+        """Calls the handler functions of the log messages received from the
+        given queue until the queue is closed.
+
+        Messages that are already waiting in the queue are processed in a
+        single batch, without yielding to the event loop between them.
+        """
+        async with queue:
+            async for message in queue:
                 message.process()
+                while True:
+                    try:
+                        message = queue.receive_nowait()
+                    except (EndOfStream, WouldBlock):
+                        break
+                    message.process()
 
 
 class Log:
@@ -796,6 +988,8 @@ class Log:
     """
 
     _block_id_generator: Iterator[int]
+    _block_queues: Dict[int, List[MemoryObjectSendStream[CRTPPacket]]]
+    _block_queue_disposer: Optional[Callable[[], None]]
     _cache: Optional[TOCCache]
     _crazyflie: Crazyflie
     _operation_lock: Lock
@@ -815,6 +1009,9 @@ class Log:
 
         self._block_id_generator = count()
 
+        self._block_queues = {}
+        self._block_queue_disposer = None
+
         self._variables = None  # type: ignore
         self._variables_by_name = None  # type: ignore
 
@@ -848,6 +1045,54 @@ class Log:
             if packet.channel == LoggingChannel.DATA and len(packet.data) >= 4:
                 yield packet
 
+    async def _block_data_packets(self, id: int) -> AsyncIterable[CRTPPacket]:
+        """Async generator that yields log data packets from a Crazyflie that
+        belong to the log block with the given ID.
+
+        Incoming log data packets are demultiplexed by a single packet handler
+        registered on the dispatcher of the Crazyflie, which looks up the
+        queues of the interested receivers by the ID of the log block. This
+        way the per-packet work does not grow with the number of log blocks
+        being received at the same time.
+        """
+        tx_queue, rx_queue = create_memory_object_stream[CRTPPacket]()
+
+        queues = self._block_queues.setdefault(id, [])
+        queues.append(tx_queue)
+        if self._block_queue_disposer is None:
+            self._block_queue_disposer = self._crazyflie.dispatcher.register(
+                self._dispatch_data_packet, port=CRTPPort.LOGGING
+            )
+
+        try:
+            async with rx_queue:
+                async for packet in rx_queue:
+                    yield packet
+        finally:
+            queues.remove(tx_queue)
+            if not queues:
+                del self._block_queues[id]
+            if not self._block_queues and self._block_queue_disposer is not None:
+                self._block_queue_disposer()
+                self._block_queue_disposer = None
+            tx_queue.close()
+
+    async def _dispatch_data_packet(self, packet: CRTPPacket) -> None:
+        """Dispatches an incoming logging-related packet to the queues of the
+        receivers interested in the log block that the packet belongs to.
+        """
+        if packet.channel == LoggingChannel.DATA:
+            data = packet.data
+            if len(data) >= 4:
+                queues = self._block_queues.get(data[0])
+                if queues:
+                    for queue in queues:
+                        try:
+                            await queue.send(packet)
+                        except (BrokenResourceError, ClosedResourceError):
+                            # Receiver went away in the meanwhile
+                            pass
+
     async def packets(self) -> AsyncIterable[CRTPPacket]:
         """Async generator that yields logging-related messages from a
         Crazyflie.
@@ -883,36 +1128,17 @@ class Log:
         """Creates a new log block with the given ID on the Crazyflie."""
         await self.validate()
         async with self._operation_lock:
-            response = await self._crazyflie.run_command(
-                port=CRTPPort.LOGGING,
-                channel=LoggingChannel.CONTROL,
-                command=(LoggingControlCommand.CREATE_BLOCK_V2, id),
-                data=block.to_bytes(),
-            )
-
-        status = int(response[0])
-        if status:
-            raise RuntimeError(
-                "Log block creation request returned error code {0} ({1})".format(
-                    status, error_to_string(status)
-                )
+            await self._run_control_command(
+                (LoggingControlCommand.CREATE_BLOCK_V2, id),
+                block.to_bytes(),
+                "creation",
             )
 
     async def _delete_log_block_by_id(self, id: int) -> None:
         """Deletes the log block with the given ID from the Crazyflie."""
         async with self._operation_lock:
-            response = await self._crazyflie.run_command(
-                port=CRTPPort.LOGGING,
-                channel=LoggingChannel.CONTROL,
-                command=(LoggingControlCommand.DELETE_BLOCK, id),
-            )
-
-        status = int(response[0])
-        if status:
-            raise RuntimeError(
-                "Log block deletion request returned error code {0} ({1})".format(
-                    status, error_to_string(status)
-                )
+            await self._run_control_command(
+                (LoggingControlCommand.DELETE_BLOCK, id), None, "deletion"
             )
 
     async def _get_log_variable_spec_by_index(
@@ -950,50 +1176,76 @@ class Log:
             command=LoggingTOCCommand.GET_INFO_V2,
         )
         try:
-            length, hash, _, _ = Struct("<HIBB").unpack(response)
+            length, hash, _, _ = _toc_info_struct.unpack(response)
         except StructError:
             raise ValueError("invalid logging TOC info response") from None
 
         return length, hash
 
-    async def _start_log_block_by_id(self, id: int, period_msec: int) -> None:
-        """Starts streaming messages from the log block with the given ID."""
-        period_byte = int(period_msec / 10)
-        if period_byte < 0 or period_byte > 255:
-            raise ValueError("logging period must be between 0 and 2.55 seconds")
+    async def _run_control_command(
+        self, command: Tuple[int, int], data: Optional[bytes], action: str
+    ) -> None:
+        """Sends a log block control command to the Crazyflie and checks the
+        status code in the response.
 
-        async with self._operation_lock:
-            response = await self._crazyflie.run_command(
-                port=CRTPPort.LOGGING,
-                channel=LoggingChannel.CONTROL,
-                command=(LoggingControlCommand.START_LOGGING, id),
-                data=(period_byte,),
-            )
+        The caller must hold the operation lock.
 
-        status = int(response[0])
+        Parameters:
+            command: the command byte and the ID of the log block
+            data: the data to send after the command bytes
+            action: short description of the requested action, used in the
+                error message
+
+        Raises:
+            RuntimeError: if the Crazyflie returned an error code
+        """
+        response = await self._crazyflie.run_command(
+            port=CRTPPort.LOGGING,
+            channel=LoggingChannel.CONTROL,
+            # Converting to bytes here in one go lets run_command() skip its
+            # generic, part-by-part conversion of the command
+            command=bytes(command),
+            data=data,
+        )
+
+        status = response[0]
         if status:
             raise RuntimeError(
-                "Log block start request returned error code {0} ({1})".format(
-                    status, error_to_string(status)
-                )
+                f"Log block {action} request returned error code {status} "
+                f"({error_to_string(status)})"
+            )
+
+    async def _start_log_block_by_id(self, id: int, period_msec: int) -> None:
+        """Starts streaming messages from the log block with the given ID."""
+        period_byte = _period_msec_to_byte(period_msec)
+        async with self._operation_lock:
+            await self._run_control_command(
+                (LoggingControlCommand.START_LOGGING, id),
+                bytes((period_byte,)),
+                "start",
             )
 
     async def _stop_log_block_by_id(self, id: int) -> None:
         """Stops streaming messages from the log block with the given ID."""
         async with self._operation_lock:
-            response = await self._crazyflie.run_command(
-                port=CRTPPort.LOGGING,
-                channel=LoggingChannel.CONTROL,
-                command=(LoggingControlCommand.STOP_LOGGING, id),
+            await self._run_control_command(
+                (LoggingControlCommand.STOP_LOGGING, id), None, "stop"
             )
 
-        status = int(response[0])
-        if status:
-            raise RuntimeError(
-                "Log block stop request returned error code {0} ({1})".format(
-                    status, error_to_string(status)
+    async def _stop_and_delete_log_block_by_id(self, id: int) -> None:
+        """Stops streaming messages from the log block with the given ID and
+        then deletes the block from the Crazyflie, sending both requests
+        back-to-back while holding the operation lock.
+        """
+        async with self._operation_lock:
+            try:
+                await self._run_control_command(
+                    (LoggingControlCommand.STOP_LOGGING, id), None, "stop"
+                )
+            finally:
+                await self._run_control_command(
+                    (LoggingControlCommand.DELETE_BLOCK, id), None, "deletion"
                 )
-            )
 
     async def _submit_block(self, block: LogBlock) -> Tuple[int, Disposer]:
         """Submits a log block to the Crazyflie for registration.
@@ -1006,6 +1258,47 @@ class Log:
         await self._create_log_block(id, block)
         return id, partial(self._delete_log_block_by_id, id)
 
+    async def _submit_and_start_block(
+        self, block: LogBlock, period_msec: int
+    ) -> Tuple[int, Disposer]:
+        """Submits a log block to the Crazyflie for registration and starts
+        streaming messages from it, sending both requests back-to-back while
+        holding the operation lock.
+
+        Returns:
+            the ID of the registered log block and an async function that can be
+            called to stop the log block and remove it from the Crazyflie
+        """
+        period_byte = _period_msec_to_byte(period_msec)
+        await self.validate()
+
+        id = next(self._block_id_generator)
+        async with self._operation_lock:
+            await self._run_control_command(
+                (LoggingControlCommand.CREATE_BLOCK_V2, id),
+                block.to_bytes(),
+                "creation",
+            )
+            started = False
+            try:
+                await self._run_control_command(
+                    (LoggingControlCommand.START_LOGGING, id),
+                    bytes((period_byte,)),
+                    "start",
+                )
+                started = True
+            finally:
+                if not started:
+                    # Do not leave a half-configured log block behind
+                    with CancelScope(shield=True):
+                        await self._run_control_command(
+                            (LoggingControlCommand.DELETE_BLOCK, id),
+                            None,
+                            "deletion",
+                        )
+
+        return id, partial(self._stop_and_delete_log_block_by_id, id)
+
     async def _validate(self):
         """Downloads the basic information about the logging subsystem of the
         Crazyflie, and that the log subsystem is in a known
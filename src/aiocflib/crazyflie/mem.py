@@ -1,16 +1,17 @@
 """Classes related to accessing the memory subsystem of a Crazyflie."""
 
-from abc import abstractmethod, abstractproperty, ABCMeta
+from abc import abstractmethod, ABCMeta
 from dataclasses import dataclass
 from enum import IntEnum
 from errno import ENODATA
 from struct import Struct, error as StructError
-from typing import Callable, ClassVar, List, Optional, Tuple
+from typing import Callable, ClassVar, Dict, List, Optional, Tuple, Union
 
-from aiocflib.crtp import CRTPPort, MemoryType
+from aiocflib.crtp import CRTPDataLike, CRTPPort, MemoryType
 from aiocflib.errors import error_to_string
 from aiocflib.utils import chunkify
 from aiocflib.utils.checksum import crc32
+from aiocflib.utils.concurrency import collapse_excgroups, gather
 from aiocflib.utils.registry import Registry
 
 from .crazyflie import Crazyflie
@@ -58,20 +59,21 @@ class MemoryElement:
     _struct: ClassVar[Struct] = Struct("<BIQ")
 
     @classmethod
-    def from_bytes(cls, index: int, data: bytes):
+    def from_bytes(cls, index: int, data: Union[bytes, bytearray, memoryview]):
         """Constructs a MemoryElement_ instance from its representation in
         the CRTP memory details packet.
 
         Parameters:
             index: the index of the memory element that is being constructed
             data: the data section of the CRTP packet, without the command byte
-                and the ID of the memory element
+                and the ID of the memory element. Any trailing bytes after the
+                memory description are ignored.
 
         Raises:
             ValueError: if the data section cannot be parsed
         """
         try:
-            return cls(index, *cls._struct.unpack(data))
+            return cls(index, *cls._struct.unpack_from(data))
         except StructError:
             raise ValueError("invalid memory description") from None
 
@@ -92,6 +94,10 @@ class MemoryHandler(metaclass=ABCMeta):
     #: Maximum number of bytes that can be written in a single request
     MAX_WRITE_REQUEST_LENGTH = 25
 
+    #: Maximum number of read or write requests that a handler keeps in flight
+    #: at the same time while reading or writing a larger block of memory
+    MAX_PENDING_REQUESTS = 4
+
     @staticmethod
     def for_element(element: MemoryElement, owner: Crazyflie) -> "MemoryHandler":
         """Constructs an appropriate memory handler for the given memory
@@ -125,12 +131,14 @@ class MemoryHandler(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
-    @abstractproperty
+    @property
+    @abstractmethod
     def size(self) -> int:
         """Returns the size of the memory that this handler handles."""
         raise NotImplementedError
 
-    @abstractproperty
+    @property
+    @abstractmethod
     def type(self) -> int:
         """Returns the type of the memory that this handler handles."""
         raise NotImplementedError
@@ -167,21 +175,34 @@ class MemoryHandlerBase(MemoryHandler):
         return result.rstrip(b"\x00") if strip else result
 
     async def read(self, addr: int, length: int) -> bytes:
-        chunks = []
-        for start, size in chunkify(
-            addr, length, step=MemoryHandler.MAX_READ_REQUEST_LENGTH
-        ):
-            chunk, status = await self._read_chunk(start, size)
-            if status == 0:
-                chunks.append(chunk)
-            else:
+        if 0 < length <= self.MAX_READ_REQUEST_LENGTH:
+            # Short reads (e.g., checksum probes) fit into a single packet so we
+            # do not need a task group for them
+            results = [await self._read_chunk(addr, length)]
+        else:
+            # Chunks are requested concurrently; the responses are matched to
+            # the requests by the address in the response header
+            with collapse_excgroups():
+                results = await gather(
+                    (
+                        (self._read_chunk, start, size)
+                        for start, size in chunkify(
+                            addr, length, step=self.MAX_READ_REQUEST_LENGTH
+                        )
+                    ),
+                    limiter=self.MAX_PENDING_REQUESTS,
+                )
+
+        for _, status in results:
+            if status:
                 raise IOError(
                     status,
                     "Read request returned error code {0} ({1})".format(
                         status, error_to_string(status)
                     ),
                 )
-        return b"".join(chunks)
+
+        return b"".join(chunk for chunk, _ in results)
 
     @property
     def size(self) -> int:
@@ -192,10 +213,27 @@ class MemoryHandlerBase(MemoryHandler):
         return self._element.type
 
     async def write(self, addr: int, data: bytes) -> None:
-        for start, size in chunkify(
-            0, len(data), step=MemoryHandler.MAX_WRITE_REQUEST_LENGTH
-        ):
-            status = await self._write_chunk(addr + start, data[start : (start + size)])
+        if 0 < len(data) <= self.MAX_WRITE_REQUEST_LENGTH:
+            # Short writes fit into a single packet so we do not need a task
+            # group for them
+            statuses = [await self._write_chunk(addr, data)]
+        else:
+            # Chunks are written concurrently; they do not overlap so the order
+            # in which the Crazyflie processes them does not matter. Chunks are
+            # sliced from a memoryview to avoid copying the data twice.
+            view = memoryview(data)
+            with collapse_excgroups():
+                statuses = await gather(
+                    (
+                        (self._write_chunk, addr + start, view[start : (start + size)])
+                        for start, size in chunkify(
+                            0, len(data), step=self.MAX_WRITE_REQUEST_LENGTH
+                        )
+                    ),
+                    limiter=self.MAX_PENDING_REQUESTS,
+                )
+
+        for status in statuses:
             if status:
                 raise IOError(
                     status,
@@ -226,7 +264,7 @@ class MemoryHandlerBase(MemoryHandler):
         )
         return (response[1:], response[0]) if response else (b"", ENODATA)
 
-    async def _write_chunk(self, addr: int, data: bytes) -> int:
+    async def _write_chunk(self, addr: int, data: CRTPDataLike) -> int:
         """Writes a chunk of data that fits into a single packet, starting
         from the given address.
 
@@ -253,8 +291,13 @@ class Memory:
     subsystem of a Crazyflie instance.
     """
 
+    #: Maximum number of memory detail requests that are kept in flight at the
+    #: same time while enumerating the memories of the Crazyflie
+    MAX_PENDING_REQUESTS = 4
+
     _crazyflie: Crazyflie
     _handlers: Optional[List[MemoryHandler]]
+    _handlers_by_type: Dict[int, List[MemoryHandler]]
 
     def __init__(self, crazyflie: Crazyflie):
         """Constructor.
@@ -265,6 +308,7 @@ class Memory:
         """
         self._crazyflie = crazyflie
         self._handlers = None
+        self._handlers_by_type = {}
 
     async def find(self, type: MemoryType) -> MemoryHandler:
         """Finds the first memory element with the given type.
@@ -280,10 +324,9 @@ class Memory:
             ValueError: if there is no such memory element
         """
         await self.validate()
-        assert self._handlers is not None
-        for handler in self._handlers:
-            if handler.type == type:
-                return handler
+        handlers = self._handlers_by_type.get(type)
+        if handlers:
+            return handlers[0]
         raise ValueError("no memory matching type {0!r}".format(type))
 
     async def find_all(self, type: MemoryType) -> List[MemoryHandler]:
@@ -298,8 +341,7 @@ class Memory:
             corresponding memory element.
         """
         await self.validate()
-        assert self._handlers is not None
-        return [handler for handler in self._handlers if handler.type == type]
+        return list(self._handlers_by_type.get(type, ()))
 
     async def find_eeprom(self) -> MemoryHandler:
         """Shortcut to find the memory handler for the internal EEPROM of the
@@ -326,7 +368,14 @@ class Memory:
         if self._handlers is not None:
             return
 
-        self._handlers = await self._validate()
+        handlers = await self._validate()
+
+        handlers_by_type: Dict[int, List[MemoryHandler]] = {}
+        for handler in handlers:
+            handlers_by_type.setdefault(handler.type, []).append(handler)
+
+        self._handlers = handlers
+        self._handlers_by_type = handlers_by_type
 
     async def write(self, type: MemoryType, addr: int, data: bytes) -> None:
         """Shortcut to write the given data to the given address of the first
@@ -418,7 +467,11 @@ class Memory:
     async def _validate(self) -> List[MemoryHandler]:
         """Downloads the basic information about the memories on the Crazyflie."""
         num_memories = await self._get_number_of_memories()
-        memories = [await self._get_memory_details(i) for i in range(num_memories)]
+        with collapse_excgroups():
+            memories = await gather(
+                ((self._get_memory_details, i) for i in range(num_memories)),
+                limiter=self.MAX_PENDING_REQUESTS,
+            )
         return [
             MemoryHandler.for_element(memory, owner=self._crazyflie)
             for memory in memories
@@ -470,15 +523,26 @@ async def write_with_checksum(
     chksum_length = len(expected_chksum)
 
     if not only_if_changed:
+        observed_chksum = None
         need_to_write = True
     else:
         observed_chksum = await handler.read(addr, chksum_length)
         need_to_write = observed_chksum != expected_chksum
 
     if need_to_write:
-        zeros = bytes([0] * chksum_length)
-        await handler.write(addr, zeros)
-        await handler.write(addr + chksum_length, data)
+        # The checksum must be invalidated _before_ the data is written and
+        # restored only _after_ the data was written completely so the data is
+        # never considered valid while it is being written. When the zeroed
+        # checksum and the data fit into a single packet, they are written
+        # together. Otherwise the invalidation can be skipped if we already
+        # know that the checksum is zero.
+        zeros = bytes(chksum_length)
+        if chksum_length + len(data) <= handler.MAX_WRITE_REQUEST_LENGTH:
+            await handler.write(addr, zeros + data)
+        else:
+            if observed_chksum != zeros:
+                await handler.write(addr, zeros)
+            await handler.write(addr + chksum_length, data)
         await handler.write(addr, expected_chksum)
 
     return chksum_length
@@ -8,6 +8,11 @@ from .crazyflie import Crazyflie
 __all__ = ("Motors",)
 
 
+#: Names of the parameters that set the power of the individual motors during a
+#: motor test, indexed by the zero-based index of the motor
+_motor_power_params = tuple(f"motorPowerSet.m{index}" for index in range(1, 5))
+
+
 class Motors:
     """Class representing the motors of a Crazyflie instance."""
 
@@ -40,14 +45,22 @@ class Motors:
                 standard Crazyflie.
             duration: the duration of the motor test, in seconds
             delay: the delay between consecutive tests, in seconds
+
+        Raises:
+            ValueError: if one of the motor indices is out of range
         """
         cf = self._crazyflie
         if indices is None:
             indices = (1, 2, 3, 4)
 
+        param_names = []
+        for motor_index in indices:
+            if motor_index < 1 or motor_index > len(_motor_power_params):
+                raise ValueError(f"invalid motor index: {motor_index}")
+            param_names.append(_motor_power_params[motor_index - 1])
+
         async with cf.parameters.set_and_restore("motorPowerSet.enable", 1, 0):
-            for index, _motor_index in enumerate(indices):
-                param_name = f"motorPowerSet.m{index + 1}"
+            for index, param_name in enumerate(param_names):
                 if index > 0:
                     await sleep(delay)
                 await cf.parameters.set(param_name, power)
@@ -6,11 +6,14 @@ from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from enum import IntEnum
 from errno import ENOENT
+from functools import cached_property
 from struct import Struct, error as StructError
-from typing import cast, Dict, List, Optional, Tuple, Union
+from sys import intern
+from typing import Any, Callable, cast, Dict, Iterable, List, Optional, Tuple, Union
 
 from aiocflib.crtp import CRTPPort
 from aiocflib.errors import error_to_string
+from aiocflib.utils.concurrency import collapse_excgroups, gather
 from aiocflib.utils.toc import TOCCache, fetch_table_of_contents_gracefully
 
 from .crazyflie import Crazyflie
@@ -18,6 +21,11 @@ from .crazyflie import Crazyflie
 __all__ = ("Parameters",)
 
 
+#: The maximum number of parameter read requests that we keep in flight at the
+#: same time while fetching the values of multiple parameters
+MAX_PENDING_READ_REQUESTS = 4
+
+
 class ParameterChannel(IntEnum):
     """Enum representing the names of the channels of the parameter service in
     the CRTP protocol.
@@ -58,22 +66,45 @@ class ParameterCommand(IntEnum):
     GET_DEFAULT_VALUE = 6
 
 
-#: Dictionary mapping integer type codes to their C types, Python structs and
-#: aliases
-_type_properties = {
+#: Tuple mapping integer type codes to their C types, Python structs and
+#: aliases. Type codes form a dense range starting from zero so we can index the
+#: tuple directly with the type code; index 4 is unused.
+_type_properties: Tuple[Optional[Tuple[str, Struct, Tuple[str, ...]]], ...] = (
     # C type, Python struct, aliases
-    0x00: ("int8_t", Struct("<b"), ("int8", "i8")),
-    0x01: ("int16_t", Struct("<h"), ("int16", "i16")),
-    0x02: ("int32_t", Struct("<i"), ("int32", "i32")),
-    0x03: ("int64_t", Struct("<q"), ("int64", "i64")),
-    0x05: ("fp16", Struct("<h"), ()),
-    0x06: ("float", Struct("<f"), ()),
-    0x07: ("double", Struct("<d"), ()),
-    0x08: ("uint8_t", Struct("<B"), ("uint8", "u8")),
-    0x09: ("uint16_t", Struct("<H"), ("uint16", "u16")),
-    0x0A: ("uint32_t", Struct("<L"), ("uint32", "u32")),
-    0x0B: ("uint64_t", Struct("<Q"), ("uint64", "u64")),
-}
+    ("int8_t", Struct("<b"), ("int8", "i8")),
+    ("int16_t", Struct("<h"), ("int16", "i16")),
+    ("int32_t", Struct("<i"), ("int32", "i32")),
+    ("int64_t", Struct("<q"), ("int64", "i64")),
+    None,
+    ("fp16", Struct("<h"), ()),
+    ("float", Struct("<f"), ()),
+    ("double", Struct("<d"), ()),
+    ("uint8_t", Struct("<B"), ("uint8", "u8")),
+    ("uint16_t", Struct("<H"), ("uint16", "u16")),
+    ("uint32_t", Struct("<L"), ("uint32", "u32")),
+    ("uint64_t", Struct("<Q"), ("uint64", "u64")),
+)
+
+#: Tuples mapping integer type codes to the bound pack and unpack methods of
+#: their Python structs, to spare attribute lookups in the hot paths
+_type_pack: Tuple[Optional[Callable[..., bytes]], ...] = tuple(
+    props[1].pack if props else None for props in _type_properties
+)
+_type_unpack: Tuple[Optional[Callable[[bytes], Tuple[Any, ...]]], ...] = tuple(
+    props[1].unpack if props else None for props in _type_properties
+)
+
+#: Tuple mapping integer type codes to the number of bytes that a single value
+#: of the type occupies
+_type_length: Tuple[int, ...] = tuple(
+    props[1].size if props else 0 for props in _type_properties
+)
+
+#: Struct used to encode the index of a parameter in parameter commands
+_index_struct = Struct("<H")
+
+#: Struct used to parse the response to a parameter TOC info request
+_toc_info_struct = Struct("<HI")
 
 
 class ParameterType(IntEnum):
@@ -107,14 +138,15 @@ class ParameterType(IntEnum):
     @property
     def aliases(self) -> Tuple[str]:
         """Returns the registered type aliases of this type."""
-        return (_type_properties[self][0],) + _type_properties[self][2]
+        props = _type_properties[self]
+        return (props[0],) + props[2]
 
     @property
     def length(self) -> int:
         """Returns the number of bytes that a single value of this log
         variable would occupy.
         """
-        return self.struct.size
+        return _type_length[self]
 
     @property
     def struct(self) -> Struct:
@@ -127,7 +159,7 @@ class ParameterType(IntEnum):
         """Encodes a single value of this parameter type into its raw byte-level
         representation.
         """
-        return self.struct.pack(value)
+        return _type_pack[self](value)
 
 
 #: Type specification for objects that can be converted into a parameter type
@@ -167,30 +199,40 @@ class ParameterSpecification:
             type = data[0] & 0x0F
             read_only = bool(data[0] & 0x40)
             has_extended_info = bool(data[0] & 0x10)
-            group, name, *rest = data[1:].split(b"\x00")
+            sep = data.index(0, 1)
+            end = data.find(0, sep + 1)
+            if end < 0:
+                end = len(data)
             return cls(
                 id=id,
                 type=type,
-                group=group.decode("ascii"),
-                name=name.decode("ascii"),
+                group=intern(str(data[1:sep], "ascii")),
+                name=intern(str(data[(sep + 1) : end], "ascii")),
                 read_only=read_only,
                 has_extended_info=has_extended_info,
             )
-        except Exception:
+        except (IndexError, ValueError):
             raise ValueError("invalid parameter description") from None
 
     def encode_value(self, value) -> bytes:
         """Encodes a single value of this parameter into its raw byte-level
         representation.
         """
-        return _type_properties[self.type][1].pack(value)
+        return _type_pack[self.type](value)
+
+    @cached_property
+    def encoded_id(self) -> bytes:
+        """Returns the numeric identifier of the parameter, encoded in the
+        format used in the commands of the parameter service.
+        """
+        return _index_struct.pack(self.id)
 
     @property
     def encoded_length(self) -> int:
         """Returns the number of bytes that will be used to encode a parameter
         of this type.
         """
-        return _type_properties[self.type][1].size
+        return _type_length[self.type]
 
     @property
     def full_name(self) -> str:
@@ -205,7 +247,7 @@ class ParameterSpecification:
         parameter, as received from the Crazyflie, and returns the corresponding
         Python value.
         """
-        return _type_properties[self.type][1].unpack(data)[0]
+        return _type_unpack[self.type](data)[0]
 
     def to_bytes(self) -> bytes:
         header = (
@@ -213,15 +255,11 @@ class ParameterSpecification:
             + (0x40 if self.read_only else 0)
             + (0x10 if self.has_extended_info else 0)
         )
-
-        parts = []
-        parts.append(bytes((header,)))
-        parts.append(self.group.encode("ascii"))
-        parts.append(b"\x00")
-        parts.append(self.name.encode("ascii"))
-        parts.append(b"\x00")
-
-        return b"".join(parts)
+        return b"%c%b\x00%b\x00" % (
+            header,
+            self.group.encode("ascii"),
+            self.name.encode("ascii"),
+        )
 
 
 @dataclass
@@ -280,12 +318,10 @@ class Parameters:
         await self.validate()
 
         parameter = self._variables_by_name[name]
-        index = parameter.id
-
         response = await self._crazyflie.run_command(
             port=CRTPPort.PARAMETERS,
             channel=ParameterChannel.MISC,
-            command=(ParameterCommand.PERSISTENT_CLEAR, index & 0xFF, index >> 8),
+            command=(ParameterCommand.PERSISTENT_CLEAR, parameter.encoded_id),
         )
 
         if len(response) < 1:
@@ -335,11 +371,10 @@ class Parameters:
         if parameter.read_only:
             raise RuntimeError("read-only parameters have no default value")
 
-        index = parameter.id
         response = await self._crazyflie.run_command(
             port=CRTPPort.PARAMETERS,
             channel=ParameterChannel.MISC,
-            command=(ParameterCommand.GET_DEFAULT_VALUE, index & 0xFF, index >> 8),
+            command=(ParameterCommand.GET_DEFAULT_VALUE, parameter.encoded_id),
         )
 
         if not response:
@@ -359,6 +394,42 @@ class Parameters:
             raise ValueError("invalid response for parameter query")
         return parameter.parse_value(response[1:])
 
+    async def get_many(
+        self, names: Iterable[str], fetch: bool = False
+    ) -> List[Union[int, float]]:
+        """Returns the current values of multiple parameters, given their
+        fully-qualified names.
+
+        Values that are not cached locally are fetched from the drone with
+        multiple requests in flight at the same time.
+
+        Parameters:
+            names: the fully-qualified names of the parameters
+            fetch: whether to forcefully fetch new values from the drone even
+                if we have locally cached copies
+
+        Returns:
+            the current values of the parameters (which may be cached values),
+            in the same order as the names
+        """
+        await self.validate()
+
+        names = list(names)
+        values = self._values
+        to_fetch = list(
+            dict.fromkeys(name for name in names if fetch or name not in values)
+        )
+
+        if to_fetch:
+            with collapse_excgroups():
+                fetched = await gather(
+                    ((self._fetch, name) for name in to_fetch),
+                    limiter=MAX_PENDING_READ_REQUESTS,
+                )
+            values.update(zip(to_fetch, fetched))
+
+        return [values[name] for name in names]
+
     async def get_persistence_state(self, name: str) -> PersistentParamState:
         """Returns the persistence state of a parameter, given its
         fully-qualified name.
@@ -373,11 +444,10 @@ class Parameters:
         await self.validate()
 
         parameter = self._variables_by_name[name]
-        index = parameter.id
         response = await self._crazyflie.run_command(
             port=CRTPPort.PARAMETERS,
             channel=ParameterChannel.MISC,
-            command=(ParameterCommand.PERSISTENT_GET_STATE, index & 0xFF, index >> 8),
+            command=(ParameterCommand.PERSISTENT_GET_STATE, parameter.encoded_id),
         )
 
         if not response:
@@ -453,12 +523,10 @@ class Parameters:
         await self.validate()
 
         parameter = self._variables_by_name[name]
-        index = parameter.id
-
         response = await self._crazyflie.run_command(
             port=CRTPPort.PARAMETERS,
             channel=ParameterChannel.MISC,
-            command=(ParameterCommand.PERSISTENT_STORE, index & 0xFF, index >> 8),
+            command=(ParameterCommand.PERSISTENT_STORE, parameter.encoded_id),
         )
 
         if len(response) < 1:
@@ -481,12 +549,10 @@ class Parameters:
         if parameter.read_only:
             raise AttributeError("{} is read only".format(name))
 
-        index = parameter.id
-
         response = await self._crazyflie.run_command(
             port=CRTPPort.PARAMETERS,
             channel=ParameterChannel.WRITE,
-            command=(index & 0xFF, index >> 8),
+            command=parameter.encoded_id,
             data=parameter.encode_value(value),
         )
 
@@ -591,12 +657,10 @@ class Parameters:
         await self.validate()
 
         parameter = self._variables_by_name[name]
-        index = parameter.id
-
         response = await self._crazyflie.run_command(
             port=CRTPPort.PARAMETERS,
             channel=ParameterChannel.READ,
-            command=(index & 0xFF, index >> 8),
+            command=parameter.encoded_id,
         )
 
         if not response:
@@ -642,7 +706,7 @@ class Parameters:
             command=ParameterTOCCommand.READ_TOC_INFO_V2,
         )
         try:
-            return cast(Tuple[int, int], Struct("<HI").unpack(response))
+            return cast(Tuple[int, int], _toc_info_struct.unpack(response))
         except StructError:
             raise ValueError("invalid parameter TOC info response") from None
 
@@ -10,8 +10,18 @@ from contextlib import asynccontextmanager
 from functools import partial
 from pathlib import Path
 from struct import Struct
-from typing import Awaitable, Callable, Iterable, Optional, Union, Tuple, TypeVar
-
+from typing import (
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Union,
+    Tuple,
+    TypeVar,
+)
+
+from aiocflib.utils.concurrency import collapse_excgroups, gather
 from aiocflib.utils.registry import Registry
 
 __all__ = ("TOCCache",)
@@ -427,6 +437,41 @@ async def _locked_cache(cache: Optional[TOCCache], key_suffix: Optional[str] = N
 
 T = TypeVar("T")
 
+#: The default number of TOC item requests that we keep in flight at the same
+#: time while downloading a table-of-contents object from the Crazyflie
+MAX_PENDING_TOC_REQUESTS = 4
+
+#: Struct used to encode TOC hashes into cache keys
+_hash_struct = Struct("<I")
+
+
+async def _fetch_items(
+    num_items: int,
+    single_item_fetcher_func: Callable[[int], Awaitable[T]],
+    max_concurrency: int = MAX_PENDING_TOC_REQUESTS,
+) -> List[T]:
+    """Fetches all the items of a table-of-contents object, keeping at most
+    the given number of requests in flight at the same time.
+
+    Parameters:
+        num_items: the number of items to fetch
+        single_item_fetcher_func: async function that fetches a single item
+            given its index
+        max_concurrency: the maximum number of requests to keep in flight
+
+    Returns:
+        the fetched items, ordered by their indices
+
+    Raises:
+        Exception: the exception raised by the fetcher function; the remaining
+            requests are cancelled in this case
+    """
+    with collapse_excgroups():
+        return await gather(
+            ((single_item_fetcher_func, i) for i in range(num_items)),
+            limiter=max_concurrency,
+        )
+
 
 async def fetch_table_of_contents_gracefully(
     cache: Optional[TOCCache],
@@ -434,9 +479,11 @@ async def fetch_table_of_contents_gracefully(
     single_item_fetcher_func: Callable[[int], Awaitable[T]],
     from_bytes: Callable[[bytes, int], T],
     to_bytes: Callable[[T], bytes],
+    *,
+    max_concurrency: int = MAX_PENDING_TOC_REQUESTS,
 ):
     num_items, hash = await info_func()
-    hash = Struct("<I").pack(hash)
+    hash = _hash_struct.pack(hash)
     result = None
 
     async with _locked_cache(cache, key_suffix=hash.hex()):
@@ -451,7 +498,9 @@ async def fetch_table_of_contents_gracefully(
         if result is None:
             # Retrieving the cached entries failed; let's try to fetch on
             # our own
-            result = [await single_item_fetcher_func(i) for i in range(num_items)]
+            result = await _fetch_items(
+                num_items, single_item_fetcher_func, max_concurrency
+            )
 
             # Store the fetched entries in the cache
             if cache:
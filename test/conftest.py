@@ -0,0 +1,103 @@
+from anyio import sleep
+from pytest import fixture
+
+from aiocflib.crtp import CRTPDispatcher, CRTPPort
+
+
+class RequestTracker:
+    """Helper object for fake devices that records the requests sent to the
+    device and keeps track of how many of them are in flight at the same time.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+
+    async def handle(self, request, delay: float = 0.001) -> None:
+        """Records the given request and simulates the time it takes for the
+        device to respond to it.
+
+        Parameters:
+            request: an arbitrary object identifying the request
+            delay: the simulated response time, in seconds
+        """
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.in_flight, self.max_in_flight)
+        try:
+            await sleep(delay)
+        finally:
+            self.in_flight -= 1
+
+
+class FakeDispatcher(CRTPDispatcher):
+    """CRTP dispatcher that keeps track of the number of handlers that are
+    currently registered in it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.num_handlers = 0
+
+    def register(self, handler, *, port=None):
+        disposer = super().register(handler, port=port)
+        self.num_handlers += 1
+
+        def dispose():
+            disposer()
+            self.num_handlers -= 1
+
+        return dispose
+
+
+class FakeCrazyflie:
+    """Fake Crazyflie that records the commands and packets sent to it and
+    forwards each command to the handler registered for its CRTP port.
+
+    Handlers are async functions that receive the channel, the command and
+    the data of the request, and return the response of the emulated
+    subsystem. Ports without a handler respond with a single 0x01 byte.
+    """
+
+    def __init__(self, tracker):
+        self.commands = []
+        self.dispatcher = FakeDispatcher()
+        self.handlers = {}
+        self.incoming = []
+        self.sent = []
+        self.tracker = tracker
+
+    def add_handler(self, port, handler) -> None:
+        """Registers an async function that emulates the subsystem of the
+        Crazyflie on the given CRTP port.
+        """
+        self.handlers[CRTPPort(port)] = handler
+
+    async def packets(self, port=None):
+        for packet in self.incoming:
+            if port is None or packet.port == port:
+                yield packet
+
+    async def run_command(self, *, port, channel, command, data=None):
+        self.commands.append(
+            {"port": port, "channel": channel, "command": command, "data": data}
+        )
+        handler = self.handlers.get(CRTPPort(port))
+        return await handler(channel, command, data) if handler else b"\x01"
+
+    async def send_packet(self, *, port, channel=0, data=None):
+        self.sent.append({"port": port, "channel": channel, "data": data})
+
+    def _get_cache_for(self, name):
+        return None
+
+
+@fixture
+def tracker():
+    return RequestTracker()
+
+
+@fixture
+def crazyflie(tracker):
+    return FakeCrazyflie(tracker)
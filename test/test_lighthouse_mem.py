@@ -38,6 +38,17 @@ class TestLighthouseBsGeometry:
         geom2 = LighthouseBsGeometry.from_json(geometry.to_json())
         assert geometry == geom2
 
+    def test_from_json_invalid_shape(self, geometry):
+        obj = geometry.to_json()
+        with raises(ValueError):
+            LighthouseBsGeometry.from_json({**obj, "origin": (1, 2)})
+        with raises(ValueError):
+            LighthouseBsGeometry.from_json({**obj, "rotation": ((1, 2, 3),)})
+        with raises(ValueError):
+            LighthouseBsGeometry.from_json(
+                {**obj, "rotation": ((1, 2, 3), (4, 5), (6, 7, 8))}
+            )
+
     def test_to_from_bytes(self, geometry):
         data = geometry.to_bytes()
         geom2 = LighthouseBsGeometry.from_bytes(data)
@@ -46,6 +57,11 @@ class TestLighthouseBsGeometry:
         with raises(ValueError):
             LighthouseBsGeometry.from_bytes(data + b"1234")
 
+    def test_to_buffer(self, geometry):
+        buf = bytearray(b"1234" + bytes(geometry.size_in_bytes) + b"56")
+        geometry.to_buffer(buf, offset=4)
+        assert buf == b"1234" + geometry.to_bytes() + b"56"
+
     def test_unpack_from_bytes(self, geometry):
         data = b"1234" + geometry.to_bytes() + b"56"
         geom2, new_offset = LighthouseBsGeometry.unpack_from_bytes(data, offset=4)
@@ -73,6 +89,11 @@ class TestLighthouseCalibrationSweep:
         with raises(ValueError):
             LighthouseCalibrationSweep.from_bytes(data + b"1234")
 
+    def test_to_buffer(self, sweep):
+        buf = bytearray(b"1234" + bytes(sweep.size_in_bytes) + b"56")
+        sweep.to_buffer(buf, offset=4)
+        assert buf == b"1234" + sweep.to_bytes() + b"56"
+
     def test_unpack_from_bytes(self, sweep):
         data = b"1234" + sweep.to_bytes() + b"56"
         sweep2, new_offset = LighthouseCalibrationSweep.unpack_from_bytes(
@@ -95,6 +116,11 @@ class TestLighthouseBsCalibration:
         calib2 = LighthouseBsCalibration.from_json(calibration.to_json())
         assert calib2 == calibration
 
+    def test_from_json_invalid_shape(self, calibration):
+        obj = calibration.to_json()
+        with raises(ValueError):
+            LighthouseBsCalibration.from_json({**obj, "sweeps": obj["sweeps"][:1]})
+
     def test_to_from_bytes(self, calibration):
         data = calibration.to_bytes()
         calib2 = LighthouseBsCalibration.from_bytes(data)
@@ -103,6 +129,11 @@ class TestLighthouseBsCalibration:
         with raises(ValueError):
             LighthouseBsCalibration.from_bytes(data + b"1234")
 
+    def test_to_buffer(self, calibration):
+        buf = bytearray(b"1234" + bytes(calibration.size_in_bytes) + b"56")
+        calibration.to_buffer(buf, offset=4)
+        assert buf == b"1234" + calibration.to_bytes() + b"56"
+
     def test_unpack_from_bytes(self, calibration):
         data = b"1234" + calibration.to_bytes() + b"56"
         calib2, new_offset = LighthouseBsCalibration.unpack_from_bytes(data, offset=4)
@@ -0,0 +1,204 @@
+from anyio import run
+from functools import partial
+from pytest import fixture, raises
+from struct import error as StructError
+
+from aiocflib.crazyflie.broadcast import (
+    broadcast_external_pose_packed,
+    broadcast_external_position_packed,
+)
+from aiocflib.crazyflie.localization import Localization
+from aiocflib.utils.quaternion import QuaternionXYZW
+
+
+def test_encode_external_position_packed():
+    data = Localization.encode_external_position_packed(
+        [(1, (1.0, -2.0, 0.5)), (2, (0, 0, 1))]
+    )
+    assert data == bytes.fromhex("01e80330f8f4010200000000e803")
+
+    assert Localization.encode_external_position_packed([]) == b""
+
+
+def test_encode_external_position_packed_large_batch():
+    items = [(i, (i, -i, 0.5)) for i in range(10)]
+    data = Localization.encode_external_position_packed(items)
+    assert data == b"".join(
+        Localization.encode_external_position_packed([item]) for item in items
+    )
+
+    # Structs for batches larger than a single packet are not cached
+    assert 10 not in Localization._external_position_packed_structs
+
+
+def test_encode_external_position_packed_rounding():
+    data = Localization.encode_external_position_packed(
+        [(3, (-0.0019, 0.0026, 1.9999))]
+    )
+    assert data == Localization.encode_external_position_packed(
+        [(3, (-0.002, 0.003, 2))]
+    )
+
+
+def test_encode_external_position_packed_range():
+    data = Localization.encode_external_position_packed(
+        [(1, (32.767, -32.768, 32.7674))]
+    )
+    assert data == bytes.fromhex("01ff7f0080ff7f")
+
+    with raises(StructError):
+        Localization.encode_external_position_packed([(1, (32.7675, 0, 0))])
+
+
+def test_encode_external_position_packed_into():
+    items = [(1, (1.0, -2.0, 0.5)), (2, (0, 0, 1))]
+    buf = bytearray(b"\xaa" * 20)
+    assert Localization.encode_external_position_packed_into(buf, 2, items) == 14
+    assert buf[:2] == b"\xaa\xaa"
+    assert buf[2:16] == Localization.encode_external_position_packed(items)
+    assert buf[16:] == b"\xaa" * 4
+
+
+def test_encode_external_pose_packed_into():
+    items = [(1, (1.0, -2.0, 0.5), QuaternionXYZW(0, 0, 0, 1))]
+    buf = bytearray(b"\xaa" * 20)
+    assert Localization.encode_external_pose_packed_into(buf, 3, items) == 11
+    assert buf[:3] == b"\xaa" * 3
+    assert buf[3:14] == Localization.encode_external_pose_packed(items)
+    assert buf[14:] == b"\xaa" * 6
+
+
+def test_encode_external_pose_packed():
+    data = Localization.encode_external_pose_packed(
+        [
+            (1, (1.0, -2.0, 0.5), QuaternionXYZW(0, 0, 0, 1)),
+            (7, (0.0, 0.0, 1.0), QuaternionXYZW(1, 0, 0, 0)),
+        ]
+    )
+    assert data == bytes.fromhex("01e80330f8f401000000c00700000000e80300000000")
+
+    assert Localization.encode_external_pose_packed([]) == b""
+
+
+@fixture
+def localization(crazyflie):
+    return Localization(crazyflie)  # type: ignore
+
+
+@fixture
+def persist(crazyflie, localization):
+    def persist(*args, **kwds):
+        assert run(partial(localization.persist_lighthouse_data, *args, **kwds))
+        return crazyflie.commands[-1]["data"]
+
+    return persist
+
+
+class TestPersistLighthouseData:
+    def test_all(self, persist):
+        data = persist()
+        assert data == b"\xff\xff\xff\xff"
+
+    def test_subset(self, persist):
+        data = persist([0, 3], [1])
+        assert data == b"\x09\x00\x02\x00"
+
+        data = persist(iter([2, 15]))
+        assert data == b"\x04\x80\x04\x80"
+
+    def test_bitmask(self, persist):
+        data = persist(calib_list=[1], geo_mask=0x8001)
+        assert data == b"\x01\x80\x02\x00"
+
+        data = persist(geo_mask=0, calib_mask=0xFFFF)
+        assert data == b"\x00\x00\xff\xff"
+
+        data = persist(geo_mask=0x0005)
+        assert data == b"\x05\x00\x05\x00"
+
+    def test_invalid(self, persist):
+        with raises(ValueError):
+            persist([0, 16])
+        with raises(ValueError):
+            persist([0], [-1])
+        with raises(ValueError):
+            persist([0.5])
+        with raises(ValueError):
+            persist(geo_mask=0x10000)
+        with raises(ValueError):
+            persist(calib_mask=-1)
+        with raises(ValueError):
+            persist([0], geo_mask=1)
+
+        # Integers are not accepted in place of ID lists, and booleans are not
+        # accepted as bitmasks
+        with raises(TypeError):
+            persist(3)
+        with raises(TypeError):
+            persist(geo_mask=True)
+
+
+def test_send_lpp_short_packet(crazyflie, localization):
+    assert run(localization.send_lpp_short_packet, 5, b"\x01\x02")
+    assert crazyflie.commands[-1]["data"] == b"\x05\x01\x02"
+
+    assert run(localization.send_lpp_short_packet, 5, b"")
+    assert crazyflie.commands[-1]["data"] == b"\x05"
+
+    with raises(ValueError):
+        run(localization.send_lpp_short_packet, 256, b"\x01")
+
+
+def test_send_external_position(crazyflie, localization):
+    expected = Localization._external_position_struct.pack(1, 2, 3)
+
+    run(localization.send_external_position, 1, 2, 3)
+    assert crazyflie.sent[-1]["data"] == expected
+
+    run(localization.send_external_position, (1, 2, 3))
+    assert crazyflie.sent[-1]["data"] == expected
+
+    with raises(TypeError):
+        run(localization.send_external_position, 1)
+    with raises(ValueError):
+        run(localization.send_external_position, (1, 2))
+
+
+def test_broadcast_external_position_packed(crazyflie):
+    items = [(i, (i, -i, 0.5)) for i in range(6)]
+    run(broadcast_external_position_packed, crazyflie, items)
+
+    assert [packet["data"] for packet in crazyflie.sent] == [
+        Localization.encode_external_position_packed(items[:4]),
+        Localization.encode_external_position_packed(items[4:]),
+    ]
+
+
+def test_broadcast_external_pose_packed(crazyflie):
+    items = [(1, (1.0, -2.0, 0.5), QuaternionXYZW(0, 0, 0, 1))]
+    run(broadcast_external_pose_packed, crazyflie, items)
+
+    (packet,) = crazyflie.sent
+    assert packet["data"] == b"\x09" + Localization.encode_external_pose_packed(items)
+
+
+def test_broadcast_external_pose_packed_multiple_packets(crazyflie):
+    items = [(i, (i, -i, 0.5), QuaternionXYZW(0, 0, 0, 1)) for i in range(5)]
+    run(broadcast_external_pose_packed, crazyflie, items)
+
+    assert [packet["data"] for packet in crazyflie.sent] == [
+        b"\x09" + Localization.encode_external_pose_packed(items[:2]),
+        b"\x09" + Localization.encode_external_pose_packed(items[2:4]),
+        b"\x09" + Localization.encode_external_pose_packed(items[4:]),
+    ]
+
+
+def test_packed_item_sizes():
+    assert Localization.EXTERNAL_POSITION_PACKED_ITEM_SIZE == 7
+    assert Localization.EXTERNAL_POSE_PACKED_ITEM_SIZE == 11
+
+
+def test_broadcast_packed_empty(crazyflie):
+    run(broadcast_external_position_packed, crazyflie, [])
+    run(broadcast_external_pose_packed, crazyflie, [])
+    assert crazyflie.sent == []
@@ -0,0 +1,348 @@
+from anyio import create_task_group, run, wait_all_tasks_blocked
+from copy import copy
+from pytest import fixture, mark, raises
+from struct import Struct
+
+from aiocflib.crazyflie.log import (
+    Log,
+    LogBlock,
+    LogBlockItem,
+    LogMessage,
+    LoggingChannel,
+    LoggingControlCommand,
+    LoggingTOCCommand,
+    VariableSpecification,
+    VariableType,
+    _process_period_and_frequency,
+)
+from aiocflib.crtp import CRTPPacket, CRTPPort
+
+
+@fixture
+def spec():
+    return VariableSpecification(
+        id=42, type=VariableType.FLOAT, group="stateEstimate", name="x"
+    )
+
+
+def test_process_period_and_frequency():
+    assert _process_period_and_frequency() == 100
+    assert _process_period_and_frequency(default=250) == 250
+    assert _process_period_and_frequency(period=0.05) == 50
+    assert _process_period_and_frequency(frequency=7) == 143
+    assert _process_period_and_frequency(period=1, frequency=20) == 50
+    assert _process_period_and_frequency(period_msec=30.7, frequency=20) == 30
+    assert isinstance(_process_period_and_frequency(frequency=3.0), int)
+
+
+class TestVariableType:
+    def test_encode_value(self):
+        assert VariableType.UINT16.encode_value(0x1234) == b"\x34\x12"
+        assert VariableType.INT8.encode_value(-1) == b"\xff"
+
+    def test_length(self):
+        assert [type.length for type in VariableType] == [1, 2, 4, 1, 2, 4, 4, 2]
+        for type in VariableType:
+            assert type.length == type.struct.size
+
+    def test_to_type(self):
+        assert VariableType.to_type("uint8_t") is VariableType.UINT8
+        assert VariableType.to_type("i16") is VariableType.INT16
+        assert VariableType.to_type(7) is VariableType.FLOAT
+        assert VariableType.to_type(VariableType.FP16) is VariableType.FP16
+
+
+class TestVariableSpecification:
+    def test_to_from_bytes(self, spec):
+        data = spec.to_bytes()
+        assert data == b"\x07stateEstimate\x00x\x00"
+        assert VariableSpecification.from_bytes(data, id=42) == spec
+
+    def test_from_invalid_bytes(self):
+        with raises(ValueError):
+            VariableSpecification.from_bytes(b"", id=1)
+        with raises(ValueError):
+            VariableSpecification.from_bytes(b"\x07group", id=1)
+        with raises(ValueError):
+            VariableSpecification.from_bytes(b"\x07gr\xffoup\x00name\x00", id=1)
+
+    def test_encode_parse_value(self, spec):
+        data = spec.encode_value(1.5)
+        assert data == b"\x00\x00\xc0\x3f"
+        assert spec.parse_value(data) == 1.5
+
+    def test_full_name(self, spec):
+        assert spec.full_name == "stateEstimate.x"
+        assert spec.full_name is spec.full_name
+
+        parsed = VariableSpecification.from_bytes(spec.to_bytes(), id=spec.id)
+        assert (
+            parsed.full_name
+            is VariableSpecification.from_bytes(spec.to_bytes(), id=spec.id).full_name
+        )
+
+
+class TestLogBlockItem:
+    def test_to_bytes(self):
+        item = LogBlockItem(
+            name="foo.bar",
+            id=0x1234,
+            fetch_as=VariableType.FP16,
+            stored_as=VariableType.FLOAT,
+        )
+        assert item.to_bytes() == b"\x87\x34\x12"
+
+
+class FakeLogging:
+    """Fake logging subsystem of a Crazyflie whose TOC contains the variables
+    ``a.x`` (FLOAT, ID 0), ``a.y`` (UINT8, ID 1) and ``b.z`` (INT16, ID 300).
+    The remaining IDs are taken by UINT8 padding variables.
+    """
+
+    _toc_info_struct = Struct("<HIBB")
+
+    def __init__(self):
+        self.variables = [
+            VariableSpecification(
+                id=index, type=VariableType.UINT8, group="pad", name=f"v{index}"
+            )
+            for index in range(301)
+        ]
+        self.variables[0] = VariableSpecification(
+            id=0, type=VariableType.FLOAT, group="a", name="x"
+        )
+        self.variables[1] = VariableSpecification(
+            id=1, type=VariableType.UINT8, group="a", name="y"
+        )
+        self.variables[300] = VariableSpecification(
+            id=300, type=VariableType.INT16, group="b", name="z"
+        )
+        self.control_commands = []
+        self.errors = {}
+
+    async def handle(self, channel, command, data):
+        if channel == LoggingChannel.TABLE_OF_CONTENTS:
+            return self._handle_toc_command(command)
+
+        assert channel == LoggingChannel.CONTROL
+        command = command if isinstance(command, int) else command[0]
+        self.control_commands.append(command)
+        return bytes((self.errors.get(command, 0),))
+
+    def _handle_toc_command(self, command):
+        if command == LoggingTOCCommand.GET_INFO_V2:
+            return self._toc_info_struct.pack(len(self.variables), 0x12345678, 0, 0)
+
+        _, lo, hi = command
+        return self.variables[(hi << 8) + lo].to_bytes()
+
+
+@fixture
+def fake_log(crazyflie):
+    fake_log = FakeLogging()
+    crazyflie.add_handler(CRTPPort.LOGGING, fake_log.handle)
+    return fake_log
+
+
+@fixture
+def log(crazyflie, fake_log):
+    return Log(crazyflie)  # type: ignore
+
+
+@fixture
+def block(log):
+    run(log.validate)
+    block = log.create_block()
+    block.add_variable("a.x")
+    block.add_variable("a.y")
+    block.add_variable("b.z", VariableType.INT8)
+    return block
+
+
+class TestLogBlock:
+    def test_add_variable(self, block):
+        with raises(KeyError):
+            block.add_variable("no.such.variable")
+
+        assert [item.name for item in block.items] == ["a.x", "a.y", "b.z"]
+        assert block.packet_size == 6
+
+    def test_to_bytes(self, block):
+        assert block.to_bytes() == b"\x77\x00\x00\x11\x01\x00\x45\x2c\x01"
+
+        block.add_variable("a.y")
+        assert block.to_bytes()[-3:] == b"\x11\x01\x00"
+
+    def test_submitted_allow_multi(self, block):
+        run(block.submit)
+
+        async def test():
+            with raises(RuntimeError):
+                async with block.submitted():
+                    pass
+            async with block.submitted(allow_multi=True):
+                pass
+
+        run(test)
+        assert block.is_submitted
+
+    def test_too_large(self, block):
+        for _ in range(5):
+            block.add_variable("a.x")
+        assert block.packet_size == 26
+
+        with raises(ValueError):
+            block.add_variable("a.x")
+        assert block.packet_size == 26
+        assert len(list(block.items)) == 8
+
+    def test_decode(self, block):
+        run(block.submit)
+        assert block.id == 0
+        assert block.is_submitted
+
+        data = b"\x00\x03\x02\x01" + b"\x00\x00\xc0\x3f" + b"\x07\xfe"
+        message = LogMessage.from_bytes(data, block=block)
+        assert message.block is block
+        assert message.timestamp == 0x010203
+        assert message.items == (1.5, 7, -2)
+        assert message.to_dict() == {"a.x": 1.5, "a.y": 7, "b.z": -2}
+
+        message = LogMessage.from_bytes(memoryview(b"\xff" + data)[1:], block=block)
+        assert message.timestamp == 0x010203
+        assert message.items == (1.5, 7, -2)
+
+    def test_copy_message(self, block):
+        run(block.submit)
+
+        data = b"\x00\x03\x02\x01" + b"\x00\x00\xc0\x3f" + b"\x07\xfe"
+        message = LogMessage.from_bytes(data, block=block)
+        copied = copy(message)
+        assert copied is not message
+        assert copied == message
+        assert copied.block is block
+
+
+class TestLogSession:
+    @mark.parametrize("queue_size", [0, 4])
+    def test_process_messages(self, crazyflie, log, queue_size):
+        crazyflie.incoming = [
+            CRTPPacket(port=CRTPPort.LOGGING, channel=LoggingChannel.DATA, data=data)
+            for data in (
+                b"\x00\x01\x00\x00\x00\x00\xc0\x3f\x07\xfe\xff",
+                b"\x01\x02\x00\x00\x00\x00\xc0\x3f\x07\xfe\xff",
+                b"\x01\x02\x00\x00\x01",
+                b"\x00\x03\x00\x00\x00\x00\x00\x00\x08\x01\x00",
+            )
+        ]
+        received = []
+
+        run(log.validate)
+        session = log.create_session()
+        session.configure(handler_queue_size=queue_size)
+        session.create_block("a.x", "a.y", "b.z", handler=received.append)
+        session.create_block("a.y")
+
+        async def test():
+            async with session:
+                await session.process_messages()
+
+        run(test)
+
+        assert [message.timestamp for message in received] == [1, 3]
+        assert received[1].items == (0.0, 8, 1)
+
+
+class TestLog:
+    def test_validate(self, log, fake_log):
+        run(log.validate)
+        assert fake_log.control_commands == [LoggingControlCommand.RESET]
+
+        block = log.create_block()
+        block.add_variable("b.z")
+        assert block.to_bytes() == b"\x55\x2c\x01"
+
+    def test_block_data_packets(self, crazyflie, log):
+        received = {3: [], 5: []}
+
+        async def receive(id, count):
+            async for packet in log._block_data_packets(id):
+                received[id].append(packet.data)
+                if len(received[id]) == count:
+                    break
+
+        async def test():
+            async with create_task_group() as tg:
+                tg.start_soon(receive, 3, 1)
+                tg.start_soon(receive, 5, 2)
+                await wait_all_tasks_blocked()
+                assert crazyflie.dispatcher.num_handlers == 1
+
+                for data in (b"\x05\x01\x00\x00", b"\x03\x02\x00\x00", b"\x05"):
+                    await crazyflie.dispatcher.dispatch(
+                        CRTPPacket(port=CRTPPort.LOGGING, channel=2, data=data)
+                    )
+                await crazyflie.dispatcher.dispatch(
+                    CRTPPacket(
+                        port=CRTPPort.LOGGING, channel=1, data=b"\x05\x00\x00\x00"
+                    )
+                )
+                await crazyflie.dispatcher.dispatch(
+                    CRTPPacket(
+                        port=CRTPPort.LOGGING, channel=2, data=b"\x05\x03\x00\x00"
+                    )
+                )
+
+        run(test)
+
+        assert received == {
+            3: [b"\x03\x02\x00\x00"],
+            5: [b"\x05\x01\x00\x00", b"\x05\x03\x00\x00"],
+        }
+
+        # The shared dispatcher handler is removed when the last receiver stops
+        assert crazyflie.dispatcher.num_handlers == 0
+
+    def test_submit_and_start_block(self, log, fake_log):
+        run(log.validate)
+        fake_log.control_commands.clear()
+
+        block = log.create_block()
+        block.add_variable("a.x")
+
+        id, disposer = run(log._submit_and_start_block, block, 100)
+        assert id == 0
+        assert fake_log.control_commands == [
+            LoggingControlCommand.CREATE_BLOCK_V2,
+            LoggingControlCommand.START_LOGGING,
+        ]
+
+        fake_log.control_commands.clear()
+        run(disposer)
+        assert fake_log.control_commands == [
+            LoggingControlCommand.STOP_LOGGING,
+            LoggingControlCommand.DELETE_BLOCK,
+        ]
+
+    def test_submit_and_start_block_failure(self, log, fake_log):
+        run(log.validate)
+        fake_log.control_commands.clear()
+        fake_log.errors[LoggingControlCommand.START_LOGGING] = 2
+
+        block = log.create_block()
+        block.add_variable("a.x")
+
+        with raises(RuntimeError, match="start request returned error code 2"):
+            run(log._submit_and_start_block, block, 100)
+
+        assert fake_log.control_commands == [
+            LoggingControlCommand.CREATE_BLOCK_V2,
+            LoggingControlCommand.START_LOGGING,
+            LoggingControlCommand.DELETE_BLOCK,
+        ]
+
+        # Cleanup failures are not swallowed
+        fake_log.control_commands.clear()
+        fake_log.errors[LoggingControlCommand.DELETE_BLOCK] = 3
+        with raises(RuntimeError, match="deletion request returned error code 3"):
+            run(log._submit_and_start_block, block, 100)
@@ -0,0 +1,187 @@
+from anyio import run
+from pytest import fixture, raises
+from struct import Struct
+
+from aiocflib.crazyflie.mem import (
+    Memory,
+    MemoryChannel,
+    MemoryElement,
+    MemoryHandler,
+    MemoryInfoCommand,
+    write_with_checksum,
+)
+from aiocflib.crtp import CRTPPort, MemoryType
+
+
+class FakeMemory:
+    """Fake memory subsystem of a Crazyflie with a single memory element."""
+
+    _addressing_struct = Struct("<BI")
+    _details_struct = Struct("<BIQ")
+
+    def __init__(self, tracker, size=256):
+        self.data = bytearray(size)
+        self.tracker = tracker
+        self.reads = []
+        self.writes = []
+        self.error_at = None
+
+    async def handle(self, channel, command, data):
+        if channel == MemoryChannel.INFO:
+            return await self._handle_info_command(command)
+
+        _, addr = self._addressing_struct.unpack(command)
+        await self.tracker.handle(addr)
+
+        if addr == self.error_at:
+            return b"\x05"
+
+        if channel == MemoryChannel.READ:
+            (length,) = data
+            self.reads.append((addr, length))
+            return b"\x00" + bytes(self.data[addr : (addr + length)])
+        else:
+            self.writes.append((addr, bytes(data)))
+            self.data[addr : (addr + len(data))] = data
+            return b"\x00"
+
+    async def _handle_info_command(self, command):
+        if command == MemoryInfoCommand.GET_NUMBER_OF_MEMORIES:
+            return b"\x06"
+
+        _, index = command
+        await self.tracker.handle(index)
+
+        return self._details_struct.pack(MemoryType.I2C, 256, index * 256)
+
+
+@fixture
+def fake_memory(crazyflie, tracker):
+    memory = FakeMemory(tracker)
+    crazyflie.add_handler(CRTPPort.MEMORY, memory.handle)
+    return memory
+
+
+def test_memory_element_from_bytes():
+    data = Struct("<BIQ").pack(MemoryType.I2C, 256, 0x1234)
+    element = MemoryElement.from_bytes(3, data)
+    assert element == MemoryElement(
+        index=3, type=MemoryType.I2C, size=256, address=0x1234
+    )
+    assert MemoryElement.from_bytes(3, memoryview(b"\xff" + data)[1:]) == element
+    assert MemoryElement.from_bytes(3, data + b"\x00") == element
+
+    with raises(ValueError):
+        MemoryElement.from_bytes(3, data[:-1])
+
+
+def create_handler(crazyflie):
+    element = MemoryElement(index=0, type=MemoryType.I2C, size=256, address=0)
+    return MemoryHandler.for_element(element, owner=crazyflie)  # type: ignore
+
+
+def test_read(crazyflie, fake_memory, tracker):
+    fake_memory.data[:] = bytes(range(256))
+    handler = create_handler(crazyflie)
+
+    assert run(handler.read, 10, 100) == bytes(range(10, 110))
+    assert sorted(fake_memory.reads) == [
+        (10, 20),
+        (30, 20),
+        (50, 20),
+        (70, 20),
+        (90, 20),
+    ]
+    assert tracker.max_in_flight == MemoryHandler.MAX_PENDING_REQUESTS
+
+    assert run(handler.read, 10, 0) == b""
+
+
+def test_read_error(crazyflie, fake_memory):
+    fake_memory.error_at = 30
+    handler = create_handler(crazyflie)
+
+    with raises(IOError, match="error code 5"):
+        run(handler.read, 10, 100)
+
+
+def test_write(crazyflie, fake_memory):
+    handler = create_handler(crazyflie)
+
+    run(handler.write, 3, bytes(range(1, 61)))
+    assert fake_memory.data[3:63] == bytes(range(1, 61))
+    assert fake_memory.data[:3] == b"\x00\x00\x00"
+    assert sorted(addr for addr, _ in fake_memory.writes) == [3, 28, 53]
+
+
+def test_write_with_checksum(crazyflie, fake_memory):
+    handler = create_handler(crazyflie)
+
+    data = b"hello world"
+    assert run(write_with_checksum, handler, 16, data) == 4
+    assert fake_memory.data[20:31] == data
+    checksum = bytes(fake_memory.data[16:20])
+    assert checksum != b"\x00\x00\x00\x00"
+
+    # Checksum is written last, after writing the data together with a zeroed
+    # checksum in a single packet
+    assert fake_memory.writes == [(16, b"\x00" * 4 + data), (16, checksum)]
+
+    fake_memory.writes.clear()
+    run(lambda: write_with_checksum(handler, 16, data, only_if_changed=True))
+    assert fake_memory.writes == []
+
+
+def test_write_with_checksum_over_empty_memory(crazyflie, fake_memory):
+    handler = create_handler(crazyflie)
+
+    data = bytes(range(1, 41))
+    run(lambda: write_with_checksum(handler, 16, data, only_if_changed=True))
+    assert fake_memory.data[20:60] == data
+
+    # Checksum was zero already so it did not need to be invalidated
+    assert sorted(addr for addr, _ in fake_memory.writes[:-1]) == [20, 45]
+    assert fake_memory.writes[-1][0] == 16
+
+
+def test_write_with_checksum_large(crazyflie, fake_memory):
+    fake_memory.data[16:20] = b"\xff" * 4
+    handler = create_handler(crazyflie)
+
+    data = bytes(range(1, 41))
+    run(lambda: write_with_checksum(handler, 16, data, only_if_changed=True))
+    assert fake_memory.data[20:60] == data
+
+    # Checksum is zeroed first, then the data is written in two chunks, then
+    # the checksum is restored
+    addrs = [addr for addr, _ in fake_memory.writes]
+    assert addrs[0] == 16 and addrs[-1] == 16
+    assert sorted(addrs[1:-1]) == [20, 45]
+
+
+def test_write_with_checksum_reads_back_checksum_every_time(crazyflie, fake_memory):
+    handler = create_handler(crazyflie)
+
+    run(lambda: write_with_checksum(handler, 16, b"hello"))
+
+    # Memory contents were lost on the Crazyflie (e.g., after a reboot) so the
+    # data must be uploaded again
+    fake_memory.data[:] = bytes(len(fake_memory.data))
+    run(lambda: write_with_checksum(handler, 16, b"hello", only_if_changed=True))
+    assert fake_memory.data[20:25] == b"hello"
+
+
+def test_validate(crazyflie, fake_memory, tracker):
+    memory = Memory(crazyflie)  # type: ignore
+
+    handlers = run(memory.find_all, MemoryType.I2C)
+    assert [handler._element.index for handler in handlers] == list(range(6))
+    assert [handler._element.address for handler in handlers] == [
+        index * 256 for index in range(6)
+    ]
+    assert tracker.max_in_flight == Memory.MAX_PENDING_REQUESTS
+
+    assert run(memory.find, MemoryType.I2C) is handlers[0]
+    assert run(memory.find_all, MemoryType.TRAJECTORY) == []
+    with raises(ValueError):
+        run(memory.find, MemoryType.TRAJECTORY)
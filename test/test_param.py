@@ -0,0 +1,134 @@
+from anyio import run
+from pytest import fixture, raises
+from struct import Struct
+
+from aiocflib.crazyflie.param import (
+    MAX_PENDING_READ_REQUESTS,
+    ParameterChannel,
+    Parameters,
+    ParameterSpecification,
+    ParameterTOCCommand,
+    ParameterType,
+)
+from aiocflib.crtp import CRTPPort
+
+
+@fixture
+def spec():
+    return ParameterSpecification(
+        id=0x1234,
+        type=ParameterType.UINT16,
+        group="kalman",
+        name="resetEstimation",
+        read_only=False,
+        has_extended_info=False,
+    )
+
+
+class TestParameterType:
+    def test_length(self):
+        assert [type.length for type in ParameterType] == [1, 2, 4, 8, 4, 8, 1, 2, 4, 8]
+        for type in ParameterType:
+            assert type.length == type.struct.size
+
+    def test_to_type(self):
+        assert ParameterType.to_type("uint8_t") is ParameterType.UINT8
+        assert ParameterType.to_type("i16") is ParameterType.INT16
+        assert ParameterType.to_type(6) is ParameterType.FLOAT
+        assert ParameterType.to_type(ParameterType.DOUBLE) is ParameterType.DOUBLE
+
+
+class TestParameterSpecification:
+    def test_encode_parse_value(self, spec):
+        assert spec.encode_value(0x0102) == b"\x02\x01"
+        assert spec.parse_value(b"\x02\x01") == 0x0102
+        assert spec.encoded_length == 2
+
+    def test_encoded_id(self, spec):
+        assert spec.encoded_id == b"\x34\x12"
+
+    def test_to_from_bytes(self, spec):
+        data = spec.to_bytes()
+        assert data == b"\x09kalman\x00resetEstimation\x00"
+        assert ParameterSpecification.from_bytes(data, id=spec.id) == spec
+
+        data = b"\x58group\x00name"
+        parsed = ParameterSpecification.from_bytes(data, id=7)
+        assert parsed.full_name == "group.name"
+        assert parsed.type == ParameterType.UINT8
+        assert parsed.read_only
+        assert parsed.has_extended_info
+
+    def test_from_invalid_bytes(self):
+        with raises(ValueError):
+            ParameterSpecification.from_bytes(b"", id=1)
+        with raises(ValueError):
+            ParameterSpecification.from_bytes(b"\x08group", id=1)
+        with raises(ValueError):
+            ParameterSpecification.from_bytes(b"\x08gr\xffoup\x00name\x00", id=1)
+
+
+class FakeParameters:
+    """Fake parameter subsystem of a Crazyflie with a given number of UINT16
+    parameters named ``test.p0``, ``test.p1`` and so on. The value of each
+    parameter is ten times its index.
+    """
+
+    def __init__(self, tracker, num_parameters):
+        self.tracker = tracker
+        self.parameters = [
+            ParameterSpecification(
+                id=index,
+                type=ParameterType.UINT16,
+                group="test",
+                name=f"p{index}",
+                read_only=False,
+                has_extended_info=False,
+            )
+            for index in range(num_parameters)
+        ]
+
+    async def handle(self, channel, command, data):
+        if channel == ParameterChannel.TABLE_OF_CONTENTS:
+            return self._handle_toc_command(command)
+
+        assert channel == ParameterChannel.READ
+        (index,) = Struct("<H").unpack(command)
+        await self.tracker.handle(index)
+        return b"\x00" + Struct("<H").pack(index * 10)
+
+    def _handle_toc_command(self, command):
+        if command == ParameterTOCCommand.READ_TOC_INFO_V2:
+            return Struct("<HI").pack(len(self.parameters), 0x12345678)
+
+        _, lo, hi = command
+        return self.parameters[(hi << 8) + lo].to_bytes()
+
+
+@fixture
+def parameters(crazyflie, tracker):
+    crazyflie.add_handler(CRTPPort.PARAMETERS, FakeParameters(tracker, 10).handle)
+    return Parameters(crazyflie)  # type: ignore
+
+
+class TestParameters:
+    def test_validate(self, parameters, tracker):
+        run(parameters.validate)
+        assert run(parameters.has, "test.p9")
+        assert not run(parameters.has, "test.p10")
+        assert tracker.requests == []
+
+    def test_get_many(self, parameters, tracker):
+        names = [f"test.p{index}" for index in (3, 1, 4, 1, 5, 9, 2, 6)]
+
+        assert run(parameters.get_many, names) == [30, 10, 40, 10, 50, 90, 20, 60]
+        assert sorted(tracker.requests) == [1, 2, 3, 4, 5, 6, 9]
+        assert tracker.max_in_flight == MAX_PENDING_READ_REQUESTS
+
+        tracker.requests.clear()
+        assert run(parameters.get_many, ["test.p0", "test.p1"]) == [0, 10]
+        assert tracker.requests == [0]
+
+        tracker.requests.clear()
+        run(lambda: parameters.get_many(["test.p1"], fetch=True))
+        assert tracker.requests == [1]
@@ -0,0 +1,13 @@
+from pytest import approx
+
+from aiocflib.utils.quaternion import (
+    QuaternionXYZW,
+    compress_unit_quaternion,
+    decompress_unit_quaternion,
+)
+
+
+def test_compress_decompress():
+    quat = QuaternionXYZW(0.5, -0.5, 0.5, 0.5)
+    decompressed = decompress_unit_quaternion(compress_unit_quaternion(quat))
+    assert decompressed == approx(quat, abs=1e-2)
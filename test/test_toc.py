@@ -0,0 +1,67 @@
+from anyio import run
+from pytest import mark, raises
+
+from aiocflib.utils.toc import InMemoryTOCCache, fetch_table_of_contents_gracefully
+
+
+class FakeDevice:
+    def __init__(self, num_items, tracker):
+        self.num_items = num_items
+        self.tracker = tracker
+
+    async def get_info(self):
+        return self.num_items, 0x12345678
+
+    async def get_item(self, index):
+        if index >= self.num_items:
+            raise IndexError(index)
+
+        # Later items arrive sooner to shuffle the order of completion
+        await self.tracker.handle(index, delay=0.001 * (self.num_items - index))
+
+        return "item{0}".format(index)
+
+
+def fetch(device, cache=None, **kwds):
+    return run(
+        lambda: fetch_table_of_contents_gracefully(
+            cache,
+            device.get_info,
+            device.get_item,
+            lambda data, id: data.decode("ascii"),
+            lambda item: item.encode("ascii"),
+            **kwds,
+        )
+    )
+
+
+@mark.parametrize("max_concurrency", [1, 4, 20])
+def test_fetch(max_concurrency, tracker):
+    device = FakeDevice(10, tracker)
+    result = fetch(device, max_concurrency=max_concurrency)
+    assert result == ["item{0}".format(i) for i in range(10)]
+    assert sorted(tracker.requests) == list(range(10))
+    assert tracker.max_in_flight == min(max_concurrency, 10)
+
+
+def test_fetch_uses_cache(tracker):
+    cache = InMemoryTOCCache()
+    device = FakeDevice(5, tracker)
+    fetch(device, cache, max_concurrency=4)
+
+    tracker.requests.clear()
+    assert fetch(device, cache, max_concurrency=4) == [
+        "item{0}".format(i) for i in range(5)
+    ]
+    assert tracker.requests == []
+
+
+def test_fetch_error(tracker):
+    device = FakeDevice(10, tracker)
+
+    async def get_info():
+        return 11, 0x12345678
+
+    device.get_info = get_info
+    with raises(IndexError):
+        fetch(device, max_concurrency=4)